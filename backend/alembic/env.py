@@ -11,6 +11,8 @@ from app.db.base import Base
 from app.core.config import settings
 from app.models.conversation import Conversation
 from app.models.turn import Turn
+from app.models.turn_outbox import TurnOutbox
+from app.models.resource_version import UserResourceVersion
 from app.models.user import Profile
 
 config = context.config
@@ -0,0 +1,41 @@
+"""add turn persistence outbox
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table('turn_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('conversation_id', sa.String(), sa.ForeignKey('conversations.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('turn_number', sa.Integer(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('user_audio', sa.LargeBinary(), nullable=True),
+        sa.Column('user_audio_content_type', sa.String(), nullable=True),
+        sa.Column('ai_audio', sa.LargeBinary(), nullable=True),
+        sa.Column('ai_audio_content_type', sa.String(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('failed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+    )
+    # The worker only scans rows that are still pending
+    op.create_index('ix_turn_outbox_next_attempt_at', 'turn_outbox', ['next_attempt_at'],
+                    postgresql_where=sa.text('failed_at IS NULL'))
+
+def downgrade() -> None:
+    op.drop_index('ix_turn_outbox_next_attempt_at', table_name='turn_outbox')
+    op.drop_table('turn_outbox')
@@ -0,0 +1,45 @@
+"""add denormalized turn counters to conversations
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column('conversations', sa.Column('turn_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('conversations', sa.Column('last_message', sa.Text(), nullable=True))
+    op.add_column('conversations', sa.Column('last_turn_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill from existing turns. Turns carry no timestamp, so last_turn_at
+    # stays NULL for history written before this migration.
+    op.execute("""
+        UPDATE conversations c
+        SET turn_count = t.turn_count,
+            last_message = t.last_message
+        FROM (
+            SELECT DISTINCT ON (conversation_id)
+                conversation_id,
+                count(*) OVER (PARTITION BY conversation_id) AS turn_count,
+                left(ai_response_text, 100) AS last_message
+            FROM turns
+            ORDER BY conversation_id, turn_number DESC
+        ) t
+        WHERE t.conversation_id = c.id
+    """)
+
+    op.create_index('ix_conversations_user_created', 'conversations', ['user_id', 'created_at', 'id'])
+
+def downgrade() -> None:
+    op.drop_index('ix_conversations_user_created', table_name='conversations')
+    op.drop_column('conversations', 'last_turn_at')
+    op.drop_column('conversations', 'last_message')
+    op.drop_column('conversations', 'turn_count')
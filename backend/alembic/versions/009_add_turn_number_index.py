@@ -0,0 +1,20 @@
+"""add (conversation_id, turn_number) index on turns
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_index('ix_turns_conversation_turn_number', 'turns', ['conversation_id', 'turn_number'])
+
+def downgrade() -> None:
+    op.drop_index('ix_turns_conversation_turn_number', table_name='turns')
@@ -0,0 +1,26 @@
+"""add unique (user_id, word) index on saved_words
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Drop duplicates left by the old check-then-insert path, keeping the first save
+    op.execute("""
+        DELETE FROM saved_words a
+        USING saved_words b
+        WHERE a.user_id = b.user_id AND a.word = b.word AND a.id > b.id
+    """)
+    op.create_index('uq_saved_words_user_word', 'saved_words', ['user_id', 'word'], unique=True)
+
+def downgrade() -> None:
+    op.drop_index('uq_saved_words_user_word', table_name='saved_words')
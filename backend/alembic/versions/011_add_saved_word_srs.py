@@ -0,0 +1,32 @@
+"""add spaced-repetition state to saved_words
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Existing words become due now (the server default fills them in)
+    op.add_column('saved_words', sa.Column('due_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')))
+    op.add_column('saved_words', sa.Column('interval_days', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('saved_words', sa.Column('ease', sa.Float(), nullable=False, server_default='2.5'))
+    op.add_column('saved_words', sa.Column('repetitions', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('saved_words', sa.Column('last_reviewed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_saved_words_user_due', 'saved_words', ['user_id', 'due_at'])
+
+def downgrade() -> None:
+    op.drop_index('ix_saved_words_user_due', table_name='saved_words')
+    op.drop_column('saved_words', 'last_reviewed_at')
+    op.drop_column('saved_words', 'repetitions')
+    op.drop_column('saved_words', 'ease')
+    op.drop_column('saved_words', 'interval_days')
+    op.drop_column('saved_words', 'due_at')
@@ -0,0 +1,26 @@
+"""add unique (user_id, proverb_id) constraint on user_proverbs
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Keep the first copy of any proverb awarded twice
+    op.execute("""
+        DELETE FROM user_proverbs a
+        USING user_proverbs b
+        WHERE a.user_id = b.user_id AND a.proverb_id = b.proverb_id AND a.id > b.id
+    """)
+    op.create_unique_constraint('uq_user_proverb', 'user_proverbs', ['user_id', 'proverb_id'])
+
+def downgrade() -> None:
+    op.drop_constraint('uq_user_proverb', 'user_proverbs', type_='unique')
@@ -0,0 +1,26 @@
+"""add per-user resource version counters
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table('user_resource_versions',
+        sa.Column('user_id', sa.String(), sa.ForeignKey('profiles.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('resource', sa.String(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='1'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+
+def downgrade() -> None:
+    op.drop_table('user_resource_versions')
@@ -0,0 +1,37 @@
+"""make (conversation_id, turn_number) unique on turns
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Renumber conversations that already hold a reused turn number (keeping order), not drop turns
+    op.execute("""
+        UPDATE turns t
+        SET turn_number = r.rn
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY conversation_id ORDER BY turn_number, id) AS rn
+            FROM turns
+            WHERE conversation_id IN (
+                SELECT conversation_id FROM turns
+                GROUP BY conversation_id, turn_number
+                HAVING count(*) > 1
+            )
+        ) r
+        WHERE t.id = r.id AND t.turn_number <> r.rn
+    """)
+    op.drop_index('ix_turns_conversation_turn_number', table_name='turns')
+    op.create_index('uq_turns_conversation_turn_number', 'turns', ['conversation_id', 'turn_number'], unique=True)
+
+def downgrade() -> None:
+    op.drop_index('uq_turns_conversation_turn_number', table_name='turns')
+    op.create_index('ix_turns_conversation_turn_number', 'turns', ['conversation_id', 'turn_number'])
@@ -0,0 +1,37 @@
+"""allocate turn numbers in the database (conversations.last_turn_number)
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column('conversations', sa.Column('last_turn_number', sa.Integer(), nullable=False, server_default='0'))
+
+    # Seed from the highest number already used by a saved or still-queued turn
+    op.execute("""
+        UPDATE conversations c
+        SET last_turn_number = n.last_turn_number
+        FROM (
+            SELECT conversation_id, max(turn_number) AS last_turn_number
+            FROM (
+                SELECT conversation_id, turn_number FROM turns
+                UNION ALL
+                SELECT conversation_id, turn_number FROM turn_outbox
+            ) used
+            GROUP BY conversation_id
+        ) n
+        WHERE n.conversation_id = c.id
+    """)
+
+def downgrade() -> None:
+    op.drop_column('conversations', 'last_turn_number')
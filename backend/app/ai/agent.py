@@ -1,6 +1,15 @@
+import threading
+from typing import Dict, Tuple
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.models.google import GoogleModel
+from pydantic_ai.providers.google import GoogleProvider
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.stats import register_stats
+from app.core.http_clients import client_pool
+
+logger = get_logger(__name__)
 
 class ConversationTurn(BaseModel):
     user_transcription: str = Field(description="Exact transcription of what the user said")
@@ -81,15 +90,104 @@ SYSTEM_PROMPTS = {
     )
 }
 
+# Ordered by preference; later models are fallbacks (or hedges) for earlier ones
+CANDIDATE_MODELS = [
+    'google-gla:gemini-2.5-flash-lite',
+    'google-gla:gemini-2.5-flash',
+    'google-gla:gemini-2.0-flash',
+]
+
+def _build_model(model: str):
+    """Bind Gemini models to the shared GenAI client; other model strings pass through."""
+    if model.startswith("google-gla:"):
+        return GoogleModel(
+            model.split(":", 1)[1],
+            provider=GoogleProvider(client=client_pool.genai()),
+        )
+    return model
+
+class AgentRegistry:
+    """
+    Process-wide cache of agents keyed by (language, model, output type, output mode).
+
+    Agents are stateless between runs, so each combination is built once
+    (lazily, or up front via `warm`) and reused by every request.
+    A `None` language builds an agent without the base language prompt, for
+    callers that pass a compiled scenario prompt as run instructions.
+    """
+
+    def __init__(self):
+        self._agents: Dict[Tuple[str | None, str, type, bool], Agent] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        language: str | None,
+        model: str,
+        output_type: type = ConversationTurn,
+        native_output: bool = False,
+    ) -> Agent:
+        if language is not None and language not in SYSTEM_PROMPTS:
+            language = "yoruba"
+        key = (language, model, output_type, native_output)
+        agent = self._agents.get(key)
+        if agent is None:
+            with self._lock:
+                agent = self._agents.get(key)
+                if agent is None:
+                    self.misses += 1
+                    agent = Agent(
+                        _build_model(model),
+                        # Native (JSON schema) output sends no tools, which provider-side
+                        # cached content requires
+                        output_type=NativeOutput(output_type) if native_output else output_type,
+                        system_prompt=SYSTEM_PROMPTS[language] if language else (),
+                    )
+                    self._agents[key] = agent
+                    return agent
+        self.hits += 1
+        return agent
+
+    def warm(self) -> int:
+        """
+        Build the agents the request paths use; returns how many are cached.
+
+        That is the language-less turn agent per candidate model, its
+        native-output variant when prompt caching is on, and the opening-line
+        agent when greetings may be generated on a store miss. Per-language
+        agents only serve the legacy /chat endpoint and stay lazy.
+        """
+        from app.ai.greetings import OpeningLine
+
+        variants = [{}]
+        if settings.PROMPT_CACHE_PROVIDER != "none":
+            variants.append({"native_output": True})
+        if settings.GREETING_GENERATE_ON_MISS:
+            variants.append({"output_type": OpeningLine})
+        for model in CANDIDATE_MODELS:
+            for kwargs in variants:
+                try:
+                    self.get(None, model, **kwargs)
+                except Exception as e:
+                    logger.warning("Could not prebuild agent %s %s: %s", model, kwargs, e)
+        return len(self._agents)
+
+    def clear(self) -> None:
+        """Drop cached agents (e.g. after the shared clients they hold are closed)."""
+        with self._lock:
+            self._agents.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._agents), "hits": self.hits, "misses": self.misses}
+
+agent_registry = AgentRegistry()
+register_stats("agent_registry", agent_registry.stats)
+
 def get_agent(language: str, model_name: str | None = None) -> Agent:
-    system_prompt = SYSTEM_PROMPTS.get(language, SYSTEM_PROMPTS["yoruba"])
-    model = model_name or 'google-gla:gemini-2.5-flash-lite'
-    
-    return Agent(
-        model,
-        output_type=ConversationTurn,
-        system_prompt=system_prompt,
-    )
+    return agent_registry.get(language, model_name or CANDIDATE_MODELS[0])
 
-# Backward compatibility: default agent for Yoruba
-agent = get_agent("yoruba")
+def get_turn_agent(model_name: str, native_output: bool = False) -> Agent:
+    """Agent for scenario turns; the compiled system prompt is supplied per run."""
+    return agent_registry.get(None, model_name, native_output=native_output)
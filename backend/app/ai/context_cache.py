@@ -0,0 +1,156 @@
+"""Provider-side caching of static prompt prefixes (e.g. Gemini cached content)."""
+
+import asyncio
+import hashlib
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Optional, Set, Tuple
+from google.genai import types
+from app.core.config import settings
+from app.core.http_clients import client_pool
+from app.core.logging import get_logger
+from app.core.stats import register_stats
+
+logger = get_logger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) for when no tokenizer is available."""
+    return max(1, len(text) // 4)
+
+
+class PromptCacheProvider:
+    """
+    Registers a static system prompt with the model provider and returns a
+    handle that later requests can reference instead of resending the text.
+
+    The base implementation caches nothing: `get_handle` returns None and
+    callers send the prompt inline.
+    """
+
+    name = "none"
+
+    def __init__(self):
+        self.hits = 0
+        self.created = 0
+        self.skipped = 0
+
+    async def get_handle(self, model: str, key: str, prompt: str) -> Optional[str]:
+        return None
+
+    async def count_tokens(self, model: str, prompt: str) -> int:
+        return estimate_tokens(prompt)
+
+    def stats(self) -> dict:
+        return {"provider": self.name, "hits": self.hits, "created": self.created, "skipped": self.skipped}
+
+
+class FakePromptCache(PromptCacheProvider):
+    """In-memory stand-in for tests: hands out deterministic handles and records registrations."""
+
+    name = "fake"
+
+    def __init__(self, min_tokens: int = 0):
+        super().__init__()
+        self.min_tokens = min_tokens
+        self.registered: Dict[Tuple[str, str], str] = {}
+
+    async def get_handle(self, model: str, key: str, prompt: str) -> Optional[str]:
+        if (model, key) in self.registered:
+            self.hits += 1
+            return self.registered[(model, key)]
+        if await self.count_tokens(model, prompt) < self.min_tokens:
+            self.skipped += 1
+            return None
+        digest = hashlib.sha256(f"{model}|{prompt}".encode("utf-8")).hexdigest()[:16]
+        handle = f"cachedContents/fake-{digest}"
+        self.registered[(model, key)] = handle
+        self.created += 1
+        return handle
+
+
+class GeminiPromptCache(PromptCacheProvider):
+    """
+    Gemini explicit context caching.
+
+    One cached-content resource per (model, prompt key), created on first
+    use and recreated shortly before its TTL runs out. Prompts below the
+    provider's minimum cacheable size are remembered and sent inline.
+    """
+
+    name = "gemini"
+    PREFIX = "google-gla:"
+
+    def __init__(self, ttl_seconds: int, min_tokens: int):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self._handles: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._too_small: Set[Tuple[str, str]] = set()
+        self._retry_after: Dict[Tuple[str, str], float] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def _usable(self, entry: Optional[Tuple[str, float]]) -> bool:
+        # Leave a margin so a handle doesn't expire mid-request
+        return entry is not None and entry[1] - 60 > time.time()
+
+    async def count_tokens(self, model: str, prompt: str) -> int:
+        model_id = model.removeprefix(self.PREFIX)
+        try:
+            response = await client_pool.genai().aio.models.count_tokens(model=model_id, contents=prompt)
+            return response.total_tokens or estimate_tokens(prompt)
+        except Exception as e:
+            logger.warning("Token count failed for %s: %s", model_id, e)
+            return estimate_tokens(prompt)
+
+    async def get_handle(self, model: str, key: str, prompt: str) -> Optional[str]:
+        if not model.startswith(self.PREFIX):
+            return None
+        cache_id = (model, key)
+        if self._usable(self._handles.get(cache_id)):
+            self.hits += 1
+            return self._handles[cache_id][0]
+        if cache_id in self._too_small or self._retry_after.get(cache_id, 0) > time.time():
+            self.skipped += 1
+            return None
+
+        async with self._locks[cache_id]:
+            if self._usable(self._handles.get(cache_id)):
+                self.hits += 1
+                return self._handles[cache_id][0]
+            if await self.count_tokens(model, prompt) < self.min_tokens:
+                self._too_small.add(cache_id)
+                self.skipped += 1
+                return None
+            try:
+                cached = await client_pool.genai().aio.caches.create(
+                    model=model.removeprefix(self.PREFIX),
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=prompt,
+                        ttl=f"{self.ttl_seconds}s",
+                        display_name=key[:128],
+                    ),
+                )
+            except Exception as e:
+                logger.warning("Could not create cached content for %s: %s", key, e)
+                self._retry_after[cache_id] = time.time() + 300
+                self.skipped += 1
+                return None
+            self._handles[cache_id] = (cached.name, time.time() + self.ttl_seconds)
+            self.created += 1
+            logger.info("Registered cached prompt %s for %s as %s", key, model, cached.name)
+            return cached.name
+
+
+@lru_cache()
+def get_prompt_cache() -> PromptCacheProvider:
+    """Prompt cache provider selected by PROMPT_CACHE_PROVIDER."""
+    if settings.PROMPT_CACHE_PROVIDER == "gemini":
+        provider = GeminiPromptCache(settings.PROMPT_CACHE_TTL_SECONDS, settings.PROMPT_CACHE_MIN_TOKENS)
+    elif settings.PROMPT_CACHE_PROVIDER == "fake":
+        provider = FakePromptCache(settings.PROMPT_CACHE_MIN_TOKENS)
+    else:
+        provider = PromptCacheProvider()
+    register_stats("prompt_cache", provider.stats)
+    return provider
@@ -0,0 +1,134 @@
+"""Pre-generated opening lines (text + audio) per (scenario, proficiency)."""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Set
+from pydantic import BaseModel, Field
+from app.ai.agent import agent_registry, CANDIDATE_MODELS
+from app.ai.hedging import run_with_fallback
+from app.ai.prompt_builder import compile_system_prompt
+from app.audio.transcode import transcode
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.tts import synthesize_speech
+
+logger = get_logger(__name__)
+
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / "data" / "greetings"
+PROFICIENCY_LEVELS = ("beginner", "intermediate", "advanced")
+
+OPENING_INSTRUCTION = (
+    "The learner has just arrived and has not said anything yet. "
+    "Open the scene with ONE short line, in character and in the target language, "
+    "that sets the scene and invites them to speak. Do not correct or evaluate anything."
+)
+
+
+class OpeningLine(BaseModel):
+    reply_text_local: str = Field(description="Your opening line, in character, in the target language")
+    reply_text_english: str = Field(description="English translation of the opening line")
+
+
+async def generate_opening_line(scenario: dict, proficiency: str) -> Optional[OpeningLine]:
+    """Ask the model for an in-character opening line; None if every model failed."""
+    system_prompt = compile_system_prompt(scenario['language'], scenario['id'], proficiency)
+
+    async def _attempt(model: str):
+        agent = agent_registry.get(None, model, output_type=OpeningLine)
+        return await agent.run(OPENING_INSTRUCTION, instructions=system_prompt)
+
+    result = await run_with_fallback(CANDIDATE_MODELS, _attempt, hedge=False)
+    return result.output if result else None
+
+
+class GreetingStore:
+    """
+    Static store of opening greetings.
+
+    Layout: `greetings.json` maps "scenario_id:proficiency" to the greeting
+    text and the name of its audio file in the same directory. Entries are
+    read once and served from memory.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._manifest: Optional[Dict[str, dict]] = None
+        self._audio: Dict[str, bytes] = {}
+        self._building: Set[str] = set()
+
+    @staticmethod
+    def key(scenario_id: str, proficiency: str) -> str:
+        return f"{scenario_id}:{proficiency}"
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "greetings.json"
+
+    def _entries(self) -> Dict[str, dict]:
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._manifest = {}
+            except (OSError, ValueError) as e:
+                logger.warning("Could not read greeting store %s: %s", self.manifest_path, e)
+                self._manifest = {}
+        return self._manifest
+
+    def get(self, scenario_id: str, proficiency: str) -> Optional[dict]:
+        """Return {'text', 'text_english', 'audio'} for a stored greeting, or None."""
+        key = self.key(scenario_id, proficiency)
+        entry = self._entries().get(key)
+        if not entry:
+            return None
+        audio = self._audio.get(key)
+        if audio is None and entry.get("audio_file"):
+            try:
+                audio = (self.root / entry["audio_file"]).read_bytes()
+                self._audio[key] = audio
+            except OSError as e:
+                logger.warning("Greeting audio missing for %s: %s", key, e)
+        return {"text": entry["text"], "text_english": entry.get("text_english"), "audio": audio}
+
+    def put(self, scenario_id: str, proficiency: str, text: str, text_english: str, audio: bytes) -> None:
+        key = self.key(scenario_id, proficiency)
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry = {"text": text, "text_english": text_english, "audio_file": None}
+        if audio:
+            entry["audio_file"] = f"{scenario_id}.{proficiency}.audio"
+            (self.root / entry["audio_file"]).write_bytes(audio)
+            self._audio[key] = audio
+        entries = self._entries()
+        entries[key] = entry
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entries, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    async def build(self, scenario: dict, proficiency: str) -> Optional[dict]:
+        """Generate, synthesize and store the greeting for one (scenario, proficiency)."""
+        key = self.key(scenario['id'], proficiency)
+        if key in self._building:
+            return None
+        self._building.add(key)
+        try:
+            line = await generate_opening_line(scenario, proficiency)
+            if line is None:
+                logger.warning("No model available to generate greeting %s", key)
+                return None
+            audio = await synthesize_speech(text=line.reply_text_local, language=scenario['language'])
+            audio, _ = await transcode(audio)
+            await asyncio.to_thread(
+                self.put, scenario['id'], proficiency, line.reply_text_local, line.reply_text_english, audio
+            )
+            logger.info("Stored greeting %s (%s audio bytes)", key, len(audio))
+            return self.get(scenario['id'], proficiency)
+        except Exception as e:
+            logger.exception("Greeting build failed for %s: %s", key, e)
+            return None
+        finally:
+            self._building.discard(key)
+
+
+greeting_store = GreetingStore(Path(settings.GREETING_STORE_DIR) if settings.GREETING_STORE_DIR else DEFAULT_STORE_DIR)
@@ -0,0 +1,131 @@
+"""Hedged (racing) model calls across an ordered list of fallback models."""
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+from pydantic_ai.exceptions import ModelHTTPError
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import FALLBACKS, MODEL_ATTEMPT_SECONDS, MODEL_ERRORS, add_timing
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per model."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, model: str, seconds: float) -> None:
+        self._samples[model].append(seconds)
+
+    def percentile(self, model: str, pct: float) -> Optional[float]:
+        """Observed latency percentile, or None until enough samples exist."""
+        samples = self._samples.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[idx]
+
+
+latency_tracker = LatencyTracker()
+
+
+def hedge_delay(model: str) -> float:
+    """How long to wait on `model` before starting the next candidate in parallel."""
+    observed = latency_tracker.percentile(model, settings.AI_HEDGE_PERCENTILE)
+    if observed is None:
+        return settings.AI_HEDGE_DELAY_SECONDS
+    return max(settings.AI_HEDGE_MIN_DELAY_SECONDS, observed)
+
+
+def _is_fatal(exc: BaseException) -> bool:
+    # Non-503 HTTP errors (bad request, auth) won't be fixed by another model
+    return isinstance(exc, ModelHTTPError) and exc.status_code != 503
+
+
+async def run_with_fallback(
+    models: List[str],
+    attempt: Callable[[str], Awaitable[T]],
+    hedge: bool | None = None,
+) -> Optional[T]:
+    """
+    Run `attempt(model)` over `models` until one succeeds.
+
+    Without hedging, models are tried one after another and the next one
+    only starts when the previous fails. With hedging, the next model is
+    also started when the current one is slower than its hedge delay; the
+    first successful result wins and the remaining calls are cancelled.
+
+    Returns:
+        The first successful result, or None if every model failed.
+
+    Raises:
+        ModelHTTPError: for non-503 HTTP errors, as these are not retryable.
+    """
+    hedge = settings.AI_HEDGE_ENABLED if hedge is None else hedge
+    pending: Dict[asyncio.Task, str] = {}
+    queue = list(models)
+
+    async def _timed(model: str) -> T:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await attempt(model)
+            outcome = "ok"
+            latency_tracker.record(model, time.perf_counter() - started)
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            MODEL_ATTEMPT_SECONDS.labels(model, outcome).observe(elapsed)
+            add_timing(f"model.{model}", elapsed)
+
+    def _launch() -> str:
+        model = queue.pop(0)
+        logger.info("Attempting AI model: %s", model)
+        pending[asyncio.create_task(_timed(model))] = model
+        return model
+
+    newest = _launch()
+    try:
+        while pending:
+            timeout = hedge_delay(newest) if hedge and queue else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.warning("Model %s slower than %.2fs; hedging with %s", newest, timeout, queue[0])
+                FALLBACKS.labels("hedge").inc()
+                newest = _launch()
+                continue
+
+            for task in done:
+                model = pending.pop(task)
+                exc = task.exception()
+                if exc is None:
+                    if pending:
+                        logger.info("Model %s won the race; cancelling %s", model, list(pending.values()))
+                    return task.result()
+                MODEL_ERRORS.labels(model, str(exc.status_code) if isinstance(exc, ModelHTTPError) else "exception").inc()
+                if _is_fatal(exc):
+                    logger.error("Model %s error: %s", model, exc)
+                    raise exc
+                if isinstance(exc, ModelHTTPError):
+                    logger.warning("Model %s overloaded (503). Trying next fallback...", model)
+                else:
+                    logger.error("Model %s unexpected error: %s", model, exc, exc_info=exc)
+
+            if not pending and queue:
+                FALLBACKS.labels("next_model").inc()
+                newest = _launch()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
@@ -1,6 +1,12 @@
 """Dynamic system prompt builder for language learning scenarios."""
 
+from functools import lru_cache
 from typing import Optional
+from app.data.content_store import content_store
+
+# Bump when the prompt template or the ConversationTurn schema changes so
+# compiled prompts (and provider-side cached copies) are rebuilt.
+PROMPT_SCHEMA_VERSION = 1
 
 # Base prompts for each language (from existing agent.py)
 BASE_LANGUAGE_PROMPTS = {
@@ -148,3 +154,40 @@ def build_system_prompt(
         )
     
     return system_prompt
+
+
+@lru_cache(maxsize=1024)
+def _compile_system_prompt(
+    language: str, scenario_id: str, proficiency_level: str, schema_version: int, content_version: str
+) -> str:
+    # content_version is part of the key so edited scenarios recompile after a hot reload
+    scenario = content_store.snapshot.scenarios.get_scenario(scenario_id) or {}
+    return build_system_prompt(
+        language=language,
+        scenario_prompt=scenario.get('system_prompt_context', scenario.get('system_prompt', '')),
+        proficiency_level=proficiency_level,
+        scenario_data=scenario,
+    )
+
+def compile_system_prompt(language: str, scenario_id: str, proficiency_level: str) -> str:
+    """
+    Memoized `build_system_prompt` for a scenario.
+
+    The result is the complete system prompt (language rules, mission,
+    culture and level instructions), so callers must not add the agent's
+    base language prompt on top of it.
+    """
+    return _compile_system_prompt(
+        getattr(language, "value", language),
+        scenario_id,
+        getattr(proficiency_level, "value", proficiency_level),
+        PROMPT_SCHEMA_VERSION,
+        content_store.version,
+    )
+
+def prompt_cache_key(language: str, scenario_id: str, proficiency_level: str) -> str:
+    """Stable identifier for a compiled prompt, used to name provider-side caches."""
+    return (
+        f"{getattr(language, 'value', language)}:{scenario_id}:"
+        f"{getattr(proficiency_level, 'value', proficiency_level)}:v{PROMPT_SCHEMA_VERSION}:{content_store.version}"
+    )
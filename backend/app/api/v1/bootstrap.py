@@ -0,0 +1,81 @@
+"""Everything the dashboard needs on first paint, in one request."""
+
+from typing import Dict, List
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import get_current_user, CurrentUser
+from app.data.content_store import content_store
+from app.db.session import get_db
+from app.models.gamification import UserProverb, UserScenarioProgress
+from app.models.schemas import BootstrapResponse, MapNode, UserProfileResponse
+from app.api.v1.conversations import load_history_page
+
+router = APIRouter(tags=["bootstrap"])
+
+# Conversations included in the bootstrap payload (later pages via /chat/history)
+HISTORY_PAGE_SIZE = 10
+
+async def _progress(db, user_id: str):
+    return (await db.execute(
+        select(UserScenarioProgress.scenario_id, UserScenarioProgress.stars, UserScenarioProgress.unlocked)
+        .where(UserScenarioProgress.user_id == user_id)
+    )).all()
+
+async def _deck_ids(db, user_id: str):
+    return (await db.execute(
+        select(UserProverb.proverb_id).where(UserProverb.user_id == user_id).order_by(UserProverb.acquired_at)
+    )).scalars().all()
+
+def build_map(scenarios: List[dict], progress: Dict[str, tuple]) -> List[MapNode]:
+    """
+    Scenarios in map order (by level) with their stars and unlock state.
+    The first stop is always open; each later one opens once the previous
+    stop has at least one star (or the row is explicitly unlocked).
+    """
+    ordered = sorted(scenarios, key=lambda s: s.get('level') or 99)
+    nodes = []
+    previous_stars = None
+    for scenario in ordered:
+        stars, unlocked = progress.get(scenario['id'], (0, False))
+        stars = stars or 0
+        nodes.append(MapNode(
+            scenario_id=scenario['id'],
+            level=scenario.get('level'),
+            stars=stars,
+            unlocked=previous_stars is None or previous_stars >= 1 or bool(unlocked),
+        ))
+        previous_stars = stars
+    return nodes
+
+@router.get("", response_model=BootstrapResponse)
+async def bootstrap(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Profile, scenario catalogue, map progress, wisdom deck and the first
+    page of conversation history. The profile is the one auth already
+    loaded; the three small indexed queries run one after another on the
+    request's session (one pooled connection per request), and scenarios
+    and proverbs come from the in-memory content store.
+    """
+    progress_rows = await _progress(db, current_user.id)
+    deck_ids = await _deck_ids(db, current_user.id)
+    history, next_cursor = await load_history_page(db, current_user.id, None, HISTORY_PAGE_SIZE)
+    
+    # One snapshot for the whole response, even if content reloads meanwhile
+    snapshot = content_store.snapshot
+    language = current_user.target_language
+    scenarios = snapshot.catalogue(language).items if language else []
+    progress = {row.scenario_id: (row.stars, row.unlocked) for row in progress_rows}
+    deck = [p for p in map(snapshot.proverbs.get_proverb, deck_ids) if p]
+    
+    return BootstrapResponse(
+        profile=UserProfileResponse.model_validate(current_user),
+        scenarios=scenarios,
+        map=build_map(snapshot.scenarios.get_scenarios_by_language(language), progress) if language else [],
+        deck=deck,
+        history=history,
+        history_next_cursor=next_cursor,
+    )
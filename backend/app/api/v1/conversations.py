@@ -1,110 +1,53 @@
 import uuid
+import json
+import asyncio
 import base64
 import logging
 from app.core.logging import get_logger
 import time
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import Optional, List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select, tuple_, update
+from typing import Optional, List, Tuple
 from pydantic_ai import BinaryContent
 from pydantic_ai.exceptions import ModelHTTPError
 from types import SimpleNamespace
 
 from app.core.auth import get_current_user, CurrentUser
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.core.metrics import FALLBACKS, PERSIST_FAILURES, stage
 from app.core.storage import storage_manager
+from app.core.turn_cache import turn_cache
+from app.workers.outbox_worker import enqueue_turn
+from app.db.base import AsyncSessionLocal
 from app.db.session import get_db
 from app.data.scenario_loader import get_scenario_loader
 from app.models.conversation import Conversation
 from app.models.turn import Turn
+from app.models.turn_outbox import TurnOutbox
 from app.models.schemas import ConversationStartRequest, ConversationStartResponse, TurnResponse, ConversationHistoryResponse
-from app.ai.agent import get_agent
-from app.ai.prompt_builder import build_system_prompt
-from app.tts import synthesize_speech
+from app.ai.agent import get_turn_agent, CANDIDATE_MODELS
+from app.ai.hedging import run_with_fallback
+from app.ai.greetings import greeting_store
+from app.ai.prompt_builder import compile_system_prompt, prompt_cache_key
+from app.ai.context_cache import get_prompt_cache
+from app.tts import merge_speech, synthesize_speech, stream_speech
+from app.audio.formats import sniff_content_type
+from app.audio.transcode import transcode
+from app.audio.preprocess import preprocess_upload
 from app.core.config import settings
 
 router = APIRouter(tags=["conversations"])
 logger = get_logger(__name__)
 
-async def process_turn_persistence(
-    db: Session,
-    user_id: str,
-    conversation_id: str,
-    turn_number: int,
-    user_audio_bytes: bytes,
-    ai_audio_bytes: bytes,
-    ai_data: any # The result.output object
-):
-    """
-    Handles the slow stuff: Uploading to Supabase and Saving to Postgres.
-    """
-    try:
-        # 1. Upload User Audio
-        # Attempt to detect content type; default to webm for browser recordings
-        def _detect_ct(b: bytes) -> str:
-            try:
-                if b[:4] == b"RIFF" and b[8:12] == b"WAVE":
-                    return "audio/wav"
-                if b[:3] == b"ID3" or (len(b) > 1 and b[0] == 0xFF):
-                    return "audio/mpeg"
-            except Exception:
-                pass
-            return "audio/webm"
-
-        user_ct = _detect_ct(user_audio_bytes)
-        user_audio_url = await storage_manager.upload_audio(
-            audio_data=user_audio_bytes,
-            user_id=user_id,
-            conversation_id=conversation_id,
-            turn_number=turn_number,
-            file_type="user",
-            content_type=user_ct,
-        )
-        
-        # 2. Upload AI Audio
-        ai_ct = _detect_ct(ai_audio_bytes)
-        ai_audio_url = await storage_manager.upload_audio(
-            audio_data=ai_audio_bytes,
-            user_id=user_id,
-            conversation_id=conversation_id,
-            turn_number=turn_number,
-            file_type="ai",
-            content_type=ai_ct,
-        )
-
-        # 3. Calculate Scores
-        grammar_score = 10 if ai_data.grammar_is_correct else 5
-
-        # 4. Save to DB
-        turn = Turn(
-            conversation_id=conversation_id,
-            turn_number=turn_number,
-            user_audio_url=user_audio_url,
-            user_transcription=ai_data.user_transcription,
-            ai_response_text=ai_data.reply_text_local,
-            ai_response_text_english=ai_data.reply_text_english,
-            ai_response_audio_url=ai_audio_url,
-            grammar_correction=ai_data.correction_feedback,
-            grammar_score=grammar_score,
-            sentiment_score=ai_data.sentiment_score,
-            negotiated_price=ai_data.current_price,
-            cultural_flag=ai_data.cultural_flag,
-            cultural_feedback=ai_data.cultural_feedback
-        )
-        
-        db.add(turn)
-        db.commit()
-        logger.info("Background task complete for Turn %s", turn_number)
-        
-    except Exception as e:
-        logger.exception("Background Persistence Error: %s", e)
-        
-
 @router.post("/start", response_model=ConversationStartResponse)
 async def start_conversation(
     request: ConversationStartRequest,
+    background_tasks: BackgroundTasks,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Start a new conversation with a specific scenario.
@@ -142,174 +85,265 @@ async def start_conversation(
     )
     
     db.add(conversation)
-    db.commit()
+    await db.commit()
     
-    # TODO: Optionally generate initial AI greeting
-    # For now, return without greeting
+    # Serve the pre-generated opening line; build it in the background on a miss
+    proficiency = getattr(current_user.proficiency_level, "value", current_user.proficiency_level)
+    greeting = greeting_store.get(request.scenario_id, proficiency)
+    if greeting is None and settings.GREETING_GENERATE_ON_MISS:
+        background_tasks.add_task(greeting_store.build, scenario, proficiency)
     
     return ConversationStartResponse(
         conversation_id=conversation_id,
-        initial_ai_greeting=None,
-        initial_ai_audio_url=None
+        initial_ai_greeting=greeting["text"] if greeting else None,
+        initial_ai_audio_url=_audio_data_uri(greeting["audio"]) if greeting and greeting["audio"] else None
     )
 
+async def _get_active_conversation(db: AsyncSession, conversation_id: str, user_id: str) -> Conversation:
+    """Fetch a conversation owned by the user, rejecting unknown or closed ones."""
+    conversation = (await db.execute(select(Conversation).where(
+        Conversation.id == conversation_id,
+        Conversation.user_id == user_id
+    ))).scalar_one_or_none()
+    
+    if not conversation or not conversation.active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid Conversation"
+        )
+    return conversation
+
+async def _load_message_history(db: AsyncSession, conversation_id: str):
+    """
+    Return the recent message history.
+
+    Served from the turn cache; on a miss both saved turns and turns still
+    waiting in the outbox are read, so the history is current.
+    """
+    history = turn_cache.message_history(conversation_id)
+    if history is None:
+        window = settings.TURN_CACHE_WINDOW
+        saved = (await db.execute(
+            select(Turn.turn_number, Turn.user_transcription, Turn.ai_response_text)
+            .where(Turn.conversation_id == conversation_id)
+            .order_by(desc(Turn.turn_number))
+            .limit(window)
+        )).all()
+        pending = (await db.execute(
+            select(TurnOutbox.turn_number, TurnOutbox.payload)
+            .where(TurnOutbox.conversation_id == conversation_id)
+            .order_by(desc(TurnOutbox.turn_number))
+            .limit(window)
+        )).all()
+
+        exchanges = {n: (user_text, ai_text) for n, user_text, ai_text in saved}
+        for n, payload in pending:
+            exchanges[n] = (payload["user_transcription"], payload["reply_text_local"])
+        recent = sorted(exchanges)[-window:]  # Chronological order
+        turn_cache.load(
+            conversation_id,
+            [exchanges[n] for n in recent],
+            recent[-1] if recent else 0,
+        )
+        history = turn_cache.message_history(conversation_id)
+    return history
+
+async def _allocate_turn_number(db: AsyncSession, conversation_id: str) -> int:
+    """Reserve the conversation's next turn number in the database, so every process agrees on it."""
+    turn_number = (await db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(last_turn_number=Conversation.last_turn_number + 1)
+        .returning(Conversation.last_turn_number)
+    )).scalar_one()
+    await db.commit()
+    return turn_number
+
+def _local_fallback_data(language: str) -> SimpleNamespace:
+    """Canned turn used when every AI model is unavailable."""
+    fallback_text_local = {
+        'yoruba': "Ẹ jọ̀ọ́, iṣẹ́ pọ̀ ju báyìí. Jọ̀wọ́ gbìmọ̀ lẹ́ẹ̀kan síi.",
+        'hausa': "Don Allah, jira kaɗan. Samfuri ya cunkushe. Gwada sake daga baya.",
+        'igbo': "Biko, chere ntakịrị. Usoro juru. Biko nwalee ọzọ.",
+    }.get(language, "Service busy. Please try again.")
+    return SimpleNamespace(
+        user_transcription="",
+        grammar_is_correct=False,
+        correction_feedback=None,
+        reply_text_local=fallback_text_local,
+        reply_text_english="Service busy. Please try again soon.",
+        sentiment_score=-0.2,
+        current_price=None,
+        cultural_flag=False,
+        cultural_feedback=None,
+    )
+
+async def _run_turn_agent(
+    current_user: CurrentUser,
+    scenario: dict,
+    message_history: List[str],
+    audio_bytes: bytes,
+    mime_type: str,
+):
+    """
+    Run the conversation agent, falling back (or hedging) across candidate models.
+
+    Returns:
+        Tuple of (turn data, used_local_fallback)
+    """
+    # Compiled (memoized) scenario prompt; it already includes the language rules
+    language = current_user.target_language
+    proficiency = current_user.proficiency_level
+    with stage("prompt_build"):
+        system_prompt = compile_system_prompt(language, scenario['id'], proficiency)
+        cache_key = prompt_cache_key(language, scenario['id'], proficiency)
+    prompt_cache = get_prompt_cache()
+    
+    async def _attempt(model: str):
+        user_parts = message_history + [
+            f"The user is speaking {language}.",
+            BinaryContent(data=audio_bytes, media_type=mime_type)
+        ]
+        handle = await prompt_cache.get_handle(model, cache_key, system_prompt)
+        if handle:
+            agent = get_turn_agent(model, native_output=True)
+            return await agent.run(user_parts, model_settings={"google_cached_content": handle})
+        return await get_turn_agent(model).run(user_parts, instructions=system_prompt)
+
+    result = await run_with_fallback(CANDIDATE_MODELS, _attempt)
+    if result is None:
+        logger.error("All AI models overloaded. Using local fallback response.")
+        FALLBACKS.labels("local_response").inc()
+        return _local_fallback_data(current_user.target_language), True
+    return result.output, False
+
+def _audio_data_uri(audio_bytes: bytes, content_type: Optional[str] = None) -> str:
+    """Convert TTS audio to a Data URI for immediate playback on frontend."""
+    ct = content_type or sniff_content_type(audio_bytes)
+    b64_audio = base64.b64encode(audio_bytes).decode('utf-8')
+    return f"data:{ct};base64,{b64_audio}"
+
+def _audio_error(used_local_fallback: bool) -> str:
+    audio_error = "tts_failed" + ("|model_overloaded" if used_local_fallback else "")
+    if settings.TTS_PROVIDER == "yarngpt":
+        audio_error += "|timeout"
+    return audio_error
+
+async def _enqueue_persistence(db: AsyncSession, user_id: str, conversation_id: str, turn_number: int,
+                         user_audio_bytes: bytes, ai_audio_bytes: bytes, data, ai_content_type: Optional[str] = None):
+    """Queue a turn in the outbox; a failure is logged and never fails the response."""
+    try:
+        with stage("persist"):
+            await enqueue_turn(db, user_id, conversation_id, turn_number, user_audio_bytes, ai_audio_bytes, data, ai_content_type)
+    except Exception as e:
+        PERSIST_FAILURES.inc()
+        await db.rollback()
+        logger.exception("Could not queue turn %s of %s for persistence: %s", turn_number, conversation_id, e)
+
+# Streamed-turn persistence tasks (kept referenced until they finish)
+_pending_persists = set()
+
+async def _persist_streamed_turn(user_id: str, conversation_id: str, turn_number: int, user_audio_bytes: bytes,
+                                 segments: Optional[List[bytes]], data, language: str) -> bytes:
+    """
+    Stitch a streamed reply's audio and queue the turn on its own session.
+
+    `segments` is None when the stream was cut short or lost a segment; the
+    reply is then synthesized in full (segments already produced come from
+    the TTS cache), so the stored audio never misses a sentence of the text.
+    Returns the stored reply audio.
+    """
+    if segments is None:
+        ai_audio_bytes = await synthesize_speech(data.reply_text_local, language)
+    else:
+        ai_audio_bytes = await merge_speech(segments, data.reply_text_local, language) if segments else b""
+    async with AsyncSessionLocal() as db:
+        # The stitched file is encoded by the outbox worker, off the response path
+        await _enqueue_persistence(db, user_id, conversation_id, turn_number, user_audio_bytes, ai_audio_bytes, data)
+    return ai_audio_bytes
+
+def _sse_event(event: str, payload: dict) -> str:
+    """Format a single Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
 @router.post("/{conversation_id}/turn", response_model=TurnResponse)
 async def create_turn(
     conversation_id: str,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Process a new turn in an existing conversation.
     Accepts user audio, processes with AI, generates TTS, and stores everything.
     """
-    t_start = time.time()
+    t_start = time.perf_counter()
     # Verify conversation exists and belongs to user
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id,
-        Conversation.user_id == current_user.id
-    ).first()
-    
-    if not conversation or not conversation.active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid Conversation"
-        )
+    with stage("conversation"):
+        conversation = await _get_active_conversation(db, conversation_id, current_user.id)
     
     # Get scenario details
     loader = get_scenario_loader()
     scenario = loader.get_scenario(conversation.scenario_id)
     
     # Read audio file
-    t_read_start = time.time()
-    audio_bytes = await file.read()
-    mime_type = file.content_type or "audio/webm"
-    t_read_end = time.time()
-    
-    # Get conversation history (last 6 turns)
-    t_hist_start =time.time()
-    previous_turns = db.query(Turn).filter(
-        Turn.conversation_id == conversation_id
-    ).order_by(desc(Turn.turn_number)).limit(6).all()
-    
-    previous_turns.reverse()  # Chronological order
+    with stage("audio_read") as t_read:
+        audio_bytes = await file.read()
+        mime_type = file.content_type or "audio/webm"
     
-    message_history = []
-    for turn in previous_turns:
-        message_history.append(f"User: {turn.user_transcription}")
-        message_history.append(f"Assistant: {turn.ai_response_text}")
-    t_hist_end = time.time()
+    # Mono 16 kHz, silence trimmed, compact codec: fewer bytes and audio tokens for the model
+    with stage("audio_prep") as t_prep:
+        model_audio, model_mime = await preprocess_upload(audio_bytes, mime_type)
     
-    # Build dynamic system prompt with full scenario data
-    t_ai_start = time.time()
-    system_prompt = build_system_prompt(
-        language=current_user.target_language,
-        scenario_prompt=scenario.get('system_prompt_context', scenario.get('system_prompt', '')),
-        proficiency_level=current_user.proficiency_level,
-        scenario_data=scenario  # Pass full scenario for mission-based prompts
-    )
+    # Get conversation history (last 6 turns)
+    with stage("history") as t_hist:
+        message_history = await _load_message_history(db, conversation_id)
+        # Release the pooled connection while the model and TTS run
+        await db.close()
     
-    candidate_models = [
-        'google-gla:gemini-2.5-flash-lite',
-        'google-gla:gemini-2.5-flash',
-        'google-gla:gemini-2.0-flash',
-    ]
-    result = None
-    last_err = None
-    for m in candidate_models:
-        logger.info("Attempting AI model: %s", m)
-        agent = get_agent(current_user.target_language, m)
-        try:
-            result = await agent.run(
-                [system_prompt] + message_history + [
-                    f"The user is speaking {current_user.target_language}.",
-                    BinaryContent(data=audio_bytes, media_type=mime_type)
-                ]
-            )
-            break
-        except ModelHTTPError as e:
-            last_err = e
-            if e.status_code == 503:
-                logger.warning("Model %s overloaded (503). Trying next fallback...", m)
-                continue
-            else:
-                logger.exception("Model %s error: %s", m, e)
-                raise
-        except Exception as e:
-            last_err = e
-            logger.exception("Model %s unexpected error: %s", m, e)
-            continue
-    used_local_fallback = False
-    if result is None:
-        logger.error("All AI models overloaded. Using local fallback response.")
-        fallback_text_local = {
-            'yoruba': "Ẹ jọ̀ọ́, iṣẹ́ pọ̀ ju báyìí. Jọ̀wọ́ gbìmọ̀ lẹ́ẹ̀kan síi.",
-            'hausa': "Don Allah, jira kaɗan. Samfuri ya cunkushe. Gwada sake daga baya.",
-            'igbo': "Biko, chere ntakịrị. Usoro juru. Biko nwalee ọzọ.",
-        }.get(current_user.target_language, "Service busy. Please try again.")
-        data = SimpleNamespace(
-            user_transcription="",
-            grammar_is_correct=False,
-            correction_feedback=None,
-            reply_text_local=fallback_text_local,
-            reply_text_english="Service busy. Please try again soon.",
-            sentiment_score=-0.2,
-            current_price=None,
-            cultural_flag=False,
-            cultural_feedback=None,
+    with stage("model") as t_ai:
+        data, used_local_fallback = await _run_turn_agent(
+            current_user, scenario, message_history, model_audio, model_mime
         )
-        used_local_fallback = True
-        t_ai_end = time.time()
-    else:
-        data = result.output
-        t_ai_end = time.time()
+    with stage("turn_number"):
+        next_turn_number = await _allocate_turn_number(db, conversation_id)
+    # Write-through: the next turn sees this exchange even before it is persisted
+    turn_cache.record_turn(conversation_id, next_turn_number, data.user_transcription, data.reply_text_local)
     
     # Run TTS (The second necessary bottleneck)
-    t_tts_start = time.time()
-    ai_audio_bytes = await synthesize_speech(
-        text=data.reply_text_local,
-        language=current_user.target_language
-    )
-    t_tts_end = time.time()
+    with stage("tts") as t_tts:
+        ai_audio_bytes = await synthesize_speech(
+            text=data.reply_text_local,
+            language=current_user.target_language
+        )
+    with stage("transcode"):
+        ai_audio_bytes, ai_content_type = await transcode(ai_audio_bytes)
     
     # Prepare response
-    # Convert audio to Data URI for immediate playback on frontend
     audio_provider = settings.TTS_PROVIDER
     audio_available = bool(ai_audio_bytes) and len(ai_audio_bytes) > 0
     audio_error = None
     if audio_available:
-        ct = "audio/wav" if settings.TTS_PROVIDER == "yarngpt" else "audio/mpeg"
-        b64_audio = base64.b64encode(ai_audio_bytes).decode('utf-8')
-        audio_data_uri = f"data:{ct};base64,{b64_audio}"
+        with stage("encode"):
+            audio_data_uri = _audio_data_uri(ai_audio_bytes, ai_content_type)
     else:
         logger.warning("TTS returned empty audio bytes")
-        audio_error = "tts_failed" + ("|model_overloaded" if used_local_fallback else "")
-        if audio_provider == "yarngpt":
-            audio_error += "|timeout"
+        audio_error = _audio_error(used_local_fallback)
         audio_data_uri = ""
     
-    next_turn_number = len(previous_turns) + 1
-    
-    #  Offload Storage to Background
-    background_tasks.add_task(
-        process_turn_persistence,
-        db, # NOTE: FastAPI manages this session, might need a fresh one if high concurrency
-        current_user.id,
-        conversation_id,
-        next_turn_number,
-        audio_bytes,
-        ai_audio_bytes,
-        data
+    # Durably queue uploads + DB insert for the outbox worker
+    await _enqueue_persistence(
+        db, current_user.id, conversation_id, next_turn_number,
+        audio_bytes, ai_audio_bytes, data, ai_content_type
     )
-    t_total = time.time() - t_start
+    t_total = time.perf_counter() - t_start
 
     logger.info(f"⏱️ TURN PERFORMANCE BREAKDOWN (Total: {t_total:.2f}s)")
-    logger.info(f"   🎤 Audio Read: {t_read_end - t_read_start:.2f}s | Size: {len(audio_bytes)/1024:.1f}KB")
-    logger.info(f"   📜 DB History: {t_hist_end - t_hist_start:.2f}s")
-    logger.info(f"   🤖 Gemini AI:  {t_ai_end - t_ai_start:.2f}s")
-    logger.info(f"   🗣️ TTS Gen:    {t_tts_end - t_tts_start:.2f}s")
+    logger.info(f"   🎤 Audio Read: {t_read.seconds:.2f}s | Size: {len(audio_bytes)/1024:.1f}KB")
+    logger.info(f"   🎚️ Audio Prep: {t_prep.seconds:.2f}s | Size: {len(model_audio)/1024:.1f}KB ({model_mime})")
+    logger.info(f"   📜 DB History: {t_hist.seconds:.2f}s")
+    logger.info(f"   🤖 Gemini AI:  {t_ai.seconds:.2f}s")
+    logger.info(f"   🗣️ TTS Gen:    {t_tts.seconds:.2f}s | Size: {len(ai_audio_bytes)/1024:.1f}KB ({ai_content_type})")
     
     return TurnResponse(
         turn_number=next_turn_number,
@@ -328,35 +362,182 @@ async def create_turn(
         cultural_feedback=data.cultural_feedback
     )
 
-@router.get("/history", response_model=List[ConversationHistoryResponse])
-async def get_conversation_history(
+@router.post("/{conversation_id}/turn/stream")
+async def create_turn_stream(
+    conversation_id: str,
+    file: UploadFile = File(...),
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Get user's conversation history with metadata.
-    Shows recent conversations for the dashboard.
+    Streaming variant of the turn endpoint (Server-Sent Events).
+
+    Emits typed events as each stage finishes so the client can render text and
+    start playback before the whole turn is done. Payload keys are the
+    `TurnResponse` field names:
+        transcription -> turn_number, transcription
+        reply         -> ai_text, ai_text_english
+        feedback      -> correction, grammar_score, sentiment_score,
+                         negotiated_price, cultural_flag, cultural_feedback
+        audio         -> segment, ai_audio_url, audio_provider (one per audio chunk)
+        done          -> the full TurnResponse (ai_audio_url left empty)
+        error         -> detail
     """
-    # Get user's conversations ordered by most recent
-    conversations = db.query(Conversation).filter(
-        Conversation.user_id == current_user.id
-    ).order_by(desc(Conversation.created_at)).limit(10).all()
+    t_start = time.time()
+    # Validate before the stream opens so errors keep proper status codes
+    with stage("conversation"):
+        conversation = await _get_active_conversation(db, conversation_id, current_user.id)
+    scenario = get_scenario_loader().get_scenario(conversation.scenario_id)
+    
+    with stage("audio_read"):
+        audio_bytes = await file.read()
+        mime_type = file.content_type or "audio/webm"
+    with stage("history"):
+        message_history = await _load_message_history(db, conversation_id)
+        # Release the pooled connection while the model and TTS run
+        await db.close()
+    language = current_user.target_language
+    user_id = current_user.id
+
+    # Stages inside the stream end after the headers are sent: histograms only, no Server-Timing
+    async def event_stream():
+        with stage("audio_prep"):
+            model_audio, model_mime = await preprocess_upload(audio_bytes, mime_type)
+        try:
+            with stage("model"):
+                data, used_local_fallback = await _run_turn_agent(
+                    current_user, scenario, message_history, model_audio, model_mime
+                )
+        except ModelHTTPError as e:
+            yield _sse_event("error", {"detail": f"AI model error ({e.status_code})"})
+            return
+        t_ai_end = time.time()
+        async with AsyncSessionLocal() as turn_db:
+            next_turn_number = await _allocate_turn_number(turn_db, conversation_id)
+        turn_cache.record_turn(conversation_id, next_turn_number, data.user_transcription, data.reply_text_local)
+
+        grammar_score = 10 if data.grammar_is_correct else 5
+        yield _sse_event("transcription", {
+            "turn_number": next_turn_number,
+            "transcription": data.user_transcription,
+        })
+        yield _sse_event("reply", {
+            "ai_text": data.reply_text_local,
+            "ai_text_english": data.reply_text_english,
+        })
+        yield _sse_event("feedback", {
+            "correction": data.correction_feedback,
+            "grammar_score": grammar_score,
+            "sentiment_score": data.sentiment_score,
+            "negotiated_price": data.current_price,
+            "cultural_flag": data.cultural_flag,
+            "cultural_feedback": data.cultural_feedback,
+        })
+
+        # Each synthesized sentence is sent as soon as it (and those before it) is ready
+        segments = []
+        complete = False
+        missing = 0
+        try:
+            async for segment in stream_speech(data.reply_text_local, language):
+                if not segment:
+                    missing += 1
+                    continue
+                encoded, content_type = await transcode(segment)
+                yield _sse_event("audio", {
+                    "segment": len(segments),
+                    "ai_audio_url": _audio_data_uri(encoded, content_type),
+                    "audio_provider": settings.TTS_PROVIDER,
+                })
+                segments.append(segment)
+            complete = True
+        finally:
+            # The reply is already shown and cached as history: persist it in its own
+            # task so a client disconnect or a failed segment can't drop the turn
+            if not complete:
+                logger.warning("Stream of turn %s of %s ended early; persisting in background", next_turn_number, conversation_id)
+            elif missing:
+                logger.warning("Streamed turn %s lost %s TTS segment(s); storing a full resynthesis", next_turn_number, missing)
+                FALLBACKS.labels("tts_whole_reply").inc()
+            persist = asyncio.create_task(_persist_streamed_turn(
+                user_id, conversation_id, next_turn_number, audio_bytes,
+                segments if complete and not missing else None, data, language
+            ))
+            _pending_persists.add(persist)
+            persist.add_done_callback(_pending_persists.discard)
+        ai_audio_bytes = await asyncio.shield(persist)
+        audio_available = bool(ai_audio_bytes)
+        audio_error = None
+        if not audio_available:
+            logger.warning("TTS returned empty audio bytes")
+            audio_error = _audio_error(used_local_fallback)
+
+        yield _sse_event("done", TurnResponse(
+            turn_number=next_turn_number,
+            transcription=data.user_transcription,
+            ai_text=data.reply_text_local,
+            ai_text_english=data.reply_text_english,
+            ai_audio_url="",
+            audio_available=audio_available,
+            audio_provider=settings.TTS_PROVIDER,
+            audio_error=audio_error,
+            correction=data.correction_feedback,
+            grammar_score=grammar_score,
+            sentiment_score=data.sentiment_score,
+            negotiated_price=data.current_price,
+            cultural_flag=data.cultural_flag,
+            cultural_feedback=data.cultural_feedback
+        ).model_dump())
+        logger.info(
+            "Streamed turn %s: first event %.2fs, total %.2fs",
+            next_turn_number, t_ai_end - t_start, time.time() - t_start
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _encode_cursor(conv: Conversation) -> str:
+    """Opaque keyset cursor: the (created_at, id) of the last conversation returned."""
+    raw = f"{conv.created_at.isoformat()}|{conv.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, conversation_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), conversation_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+async def load_history_page(
+    db: AsyncSession,
+    user_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+) -> Tuple[List[ConversationHistoryResponse], Optional[str]]:
+    """One page of a user's conversations, newest first, and the next page's cursor (if any)."""
+    query = select(Conversation).where(Conversation.user_id == user_id)
+    if cursor:
+        query = query.where(tuple_(Conversation.created_at, Conversation.id) < _decode_cursor(cursor))
+    # One extra row tells whether another page exists
+    conversations = (await db.execute(
+        query.order_by(desc(Conversation.created_at), desc(Conversation.id)).limit(limit + 1)
+    )).scalars().all()
+    
+    next_cursor = None
+    if len(conversations) > limit:
+        conversations = conversations[:limit]
+        next_cursor = _encode_cursor(conversations[-1])
     
     loader = get_scenario_loader()
     result = []
     
     for conv in conversations:
-        # Get turn count
-        turn_count = db.query(Turn).filter(
-            Turn.conversation_id == conv.id
-        ).count()
-        
-        # Get latest turn for preview
-        latest_turn = db.query(Turn).filter(
-            Turn.conversation_id == conv.id
-        ).order_by(desc(Turn.turn_number)).first()
-        
-        # Get scenario details
         scenario = loader.get_scenario(conv.scenario_id)
         
         result.append(ConversationHistoryResponse(
@@ -364,28 +545,75 @@ async def get_conversation_history(
             scenario_title=scenario['title'] if scenario else "Unknown Scenario",
             scenario_id=conv.scenario_id,
             created_at=conv.created_at,
-            turn_count=turn_count,
-            last_message=latest_turn.ai_response_text[:100] if latest_turn else None,
+            turn_count=conv.turn_count,
+            last_message=conv.last_message,
+            last_turn_at=conv.last_turn_at,
             active=conv.active
         ))
     
+    return result, next_cursor
+
+@router.get("/history", response_model=List[ConversationHistoryResponse])
+async def get_conversation_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get user's conversation history with metadata, newest first.
+    Shows recent conversations for the dashboard.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to fetch the
+    next page; the header is absent on the last page.
+    """
+    result, next_cursor = await load_history_page(db, current_user.id, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
     return result
 
+# Columns TurnResponse is built from
+TURN_COLUMNS = (
+    Turn.turn_number,
+    Turn.user_transcription,
+    Turn.ai_response_text,
+    Turn.ai_response_text_english,
+    Turn.ai_response_audio_url,
+    Turn.grammar_correction,
+    Turn.grammar_score,
+    Turn.sentiment_score,
+    Turn.negotiated_price,
+    Turn.cultural_flag,
+    Turn.cultural_feedback,
+)
+
 @router.get("/{conversation_id}/turns", response_model=List[TurnResponse])
 async def get_conversation_turns(
     conversation_id: str,
+    request: Request,
+    response: Response,
+    after_turn: Optional[int] = Query(None, ge=0),
+    before_turn: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Fetch all turns for a specific conversation.
+    Fetch turns for a specific conversation, in chronological order.
     Used to restore conversation history when user returns to a chat.
+
+    By default the latest `limit` turns are returned; `before_turn` pages
+    further back and `after_turn` returns only turns newer than the ones a
+    client already has. `X-Has-More: true` means the page was cut at
+    `limit`. Responses carry a strong ETag and honour If-None-Match.
     """
     # Verify conversation exists and belongs to user
-    conv = db.query(Conversation).filter(
+    conv = (await db.execute(select(Conversation.turn_count, Conversation.last_turn_at).where(
         Conversation.id == conversation_id,
         Conversation.user_id == current_user.id
-    ).first()
+    ))).one_or_none()
     
     if not conv:
         raise HTTPException(
@@ -393,10 +621,27 @@ async def get_conversation_turns(
             detail="Conversation not found"
         )
     
-    # Fetch all turns in chronological order
-    turns = db.query(Turn).filter(
-        Turn.conversation_id == conversation_id
-    ).order_by(Turn.turn_number.asc()).all()
+    # Saved turns never change, so the counters identify the transcript
+    etag = make_etag(conversation_id, conv.turn_count, conv.last_turn_at, after_turn, before_turn, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    query = select(*TURN_COLUMNS).where(Turn.conversation_id == conversation_id)
+    if after_turn is not None:
+        query = query.where(Turn.turn_number > after_turn).order_by(Turn.turn_number.asc())
+    else:
+        if before_turn is not None:
+            query = query.where(Turn.turn_number < before_turn)
+        query = query.order_by(Turn.turn_number.desc())
+    # One extra row tells whether the page was cut
+    turns = (await db.execute(query.limit(limit + 1))).all()
+    
+    if len(turns) > limit:
+        turns = turns[:limit]
+        response.headers["X-Has-More"] = "true"
+    if after_turn is None:
+        turns = turns[::-1]  # Chronological order
+    set_etag(response, etag)
     
     return [
         TurnResponse(
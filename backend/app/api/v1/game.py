@@ -1,79 +1,110 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-import random
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.core.auth import get_current_user, CurrentUser
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.core.resource_versions import DECK, PROGRESS, bump_versions, get_version
+from app.data.content_store import content_store
 from app.models.gamification import UserScenarioProgress, UserProverb
+from app.models.schemas import FinishScenarioRequest
 from app.data.proverb_loader import get_proverb_loader
 
 router = APIRouter(tags=["game"])
 
+# Attempts to award a proverb when concurrent finishes race for the same one
+LOOT_ATTEMPTS = 3
+
 @router.post("/finish_scenario")
 async def finish_scenario(
-    payload: dict,
+    payload: FinishScenarioRequest,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
 
-    scenario_id = payload.get("scenario_id")
-    stars = payload.get("stars")
-    # 1. Update Progress
-    progress = db.query(UserScenarioProgress).filter_by(
-        user_id=current_user.id, scenario_id=scenario_id
-    ).first()
-    
-    if not progress:
-        progress = UserScenarioProgress(user_id=current_user.id, scenario_id=scenario_id)
-        db.add(progress)
+    scenario_id = payload.scenario_id
+    stars = payload.stars
     
-    # Only update if new score is better
-    if stars > progress.stars:
-        progress.stars = stars
+    # 1. Update Progress (upsert; only keep the best score)
+    progress = insert(UserScenarioProgress).values(user_id=current_user.id, scenario_id=scenario_id, stars=stars)
+    current_stars = func.coalesce(UserScenarioProgress.stars, 0)
+    await db.execute(progress.on_conflict_do_update(
+        constraint="uq_user_scenario",
+        set_={
+            "stars": case((progress.excluded.stars > current_stars, progress.excluded.stars), else_=current_stars),
+            "updated_at": func.now(),
+        },
+    ))
     
     # 2. Loot Logic 
     loot = None
     if stars >= 2:
         loader = get_proverb_loader()
         # Get IDs user already has
-        user_owned_ids = [
-            up.proverb_id for up in 
-            db.query(UserProverb).filter(UserProverb.user_id == current_user.id).all()
-        ]
+        owned = set((await db.execute(
+            select(UserProverb.proverb_id).where(UserProverb.user_id == current_user.id)
+        )).scalars().all())
         
-        # Get available proverbs in user's language
-        available_proverbs = [
-            p for p in loader.get_proverbs_by_language(current_user.target_language)
-            if p['id'] not in user_owned_ids
-        ]
-        
-        # Random pick
-        if available_proverbs:
-            new_proverb = random.choice(available_proverbs)
-            
-            # Save ownership to DB
-            user_proverb = UserProverb(user_id=current_user.id, proverb_id=new_proverb['id'])
-            db.add(user_proverb)
-            db.commit()
+        for _ in range(LOOT_ATTEMPTS):
+            # Rarity-weighted pick among proverbs not owned yet
+            candidate = loader.sample_unowned(current_user.target_language, owned)
+            if candidate is None:
+                break
             
-            loot = new_proverb
+            # Save ownership; the unique (user_id, proverb_id) index rejects a proverb
+            # a concurrent request just awarded, in which case we draw again
+            awarded = (await db.execute(
+                insert(UserProverb)
+                .values(user_id=current_user.id, proverb_id=candidate['id'])
+                .on_conflict_do_nothing(index_elements=["user_id", "proverb_id"])
+                .returning(UserProverb.id)
+            )).scalar_one_or_none()
+            if awarded is not None:
+                loot = candidate
+                break
+            owned.add(candidate['id'])
+    
+    # Progress, loot and the dashboard cache versions are committed together
+    await bump_versions(db, current_user.id, PROGRESS, *([DECK] if loot else []))
+    await db.commit()
 
     return {"success": True, "stars": stars, "loot": loot}
 
 @router.get("/progress")
 async def get_progress(
+    request: Request,
+    response: Response,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return db.query(UserScenarioProgress).filter_by(user_id=current_user.id).all()
+    etag = make_etag(current_user.id, PROGRESS, await get_version(db, current_user.id, PROGRESS))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    return (await db.execute(
+        select(UserScenarioProgress).filter_by(user_id=current_user.id)
+    )).scalars().all()
 
 @router.get("/deck")
 async def get_wisdom_deck(
+    request: Request,
+    response: Response,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
+    # Proverb texts come from the content store, so its version is part of the tag
+    version = await get_version(db, current_user.id, DECK)
+    etag = make_etag(current_user.id, DECK, version, content_store.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
     # 1. Get IDs from DB
-    user_proverbs = db.query(UserProverb).filter_by(user_id=current_user.id).all()
+    user_proverbs = (await db.execute(
+        select(UserProverb).filter_by(user_id=current_user.id)
+    )).scalars().all()
     
     # 2. Get Content from JSON Loader
     loader = get_proverb_loader()
@@ -1,25 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Request, Response
+from typing import List, Optional
 from app.core.auth import get_current_user, CurrentUser
-from app.db.session import get_db
-from app.data.scenario_loader import get_scenario_loader
+from app.core.etag import CACHE_CONTROL, etag_matches, not_modified
+from app.data.content_store import content_store
 from app.models.schemas import ScenarioResponse
 
 router = APIRouter(tags=["scenarios"])
 
 @router.get("", response_model=List[ScenarioResponse])
 async def get_scenarios(
+    request: Request,
+    category: Optional[str] = None,
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
-    Get all scenarios for the user's target language.
+    Get all scenarios for the user's target language, optionally one category.
     Returns empty list if user hasn't completed onboarding.
+
+    Served from the JSON pre-rendered for the current content version.
     """
     if not current_user.target_language:
         return []
     
-    loader = get_scenario_loader()
-    scenarios = loader.get_scenarios_by_language(current_user.target_language)
+    rendered = content_store.snapshot.catalogue(current_user.target_language, category)
+    if etag_matches(request, rendered.etag):
+        return not_modified(rendered.etag)
     
-    return scenarios
+    return Response(
+        content=rendered.body,
+        media_type="application/json",
+        headers={"ETag": rendered.etag, "Cache-Control": CACHE_CONTROL},
+    )
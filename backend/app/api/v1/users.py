@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.auth import get_current_user, CurrentUser
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import get_current_user, invalidate_user, CurrentUser
 from app.db.session import get_db
 from app.models.user import Profile
 from app.models.schemas import UserProfileUpdate, UserProfileResponse
@@ -11,13 +12,13 @@ router = APIRouter(tags=["users"])
 async def update_user_profile(
     profile: UserProfileUpdate,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update user profile with target language and proficiency level.
     Called during onboarding.
     """
-    user = db.query(Profile).filter(Profile.id == current_user.id).first()
+    user = (await db.execute(select(Profile).where(Profile.id == current_user.id))).scalar_one_or_none()
     
     if not user:
         raise HTTPException(
@@ -29,18 +30,19 @@ async def update_user_profile(
     user.target_language = profile.target_language
     user.proficiency_level = profile.proficiency_level
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user.id)
     
     return user
 
 @router.get("/profile", response_model=UserProfileResponse)
 async def get_user_profile(
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current user's profile."""
-    user = db.query(Profile).filter(Profile.id == current_user.id).first()
+    user = (await db.execute(select(Profile).where(Profile.id == current_user.id))).scalar_one_or_none()
     
     if not user:
         raise HTTPException(
@@ -1,82 +1,198 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence, Tuple
 
 from app.core.auth import get_current_user, CurrentUser
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.core.resource_versions import VOCABULARY, bump_versions, get_version
+from app.core.srs import ReviewState, next_due, schedule
 from app.db.session import get_db
 from app.models.saved_word import SavedWord
-from app.models.schemas import SaveWordRequest, SavedWordResponse
+from app.models.schemas import ReviewWordRequest, SaveWordRequest, SaveWordsRequest, SaveWordResult, SaveWordsResponse, SavedWordResponse
 
 router = APIRouter(tags=["vocabulary"])
 
+async def save_words(
+    db: AsyncSession,
+    user_id: str,
+    language: str,
+    items: Sequence[SaveWordRequest],
+) -> List[Tuple[str, Optional[SavedWord]]]:
+    """
+    Insert words with a single INSERT ... ON CONFLICT DO NOTHING on
+    (user_id, word) and commit.
+
+    Returns (status, row) per item in input order: ("created", new row) or
+    ("duplicate", None) for words already saved or repeated in `items`.
+    """
+    unique = {}
+    for item in items:
+        unique.setdefault(item.word, item)
+    inserted = {}
+    if unique:
+        stmt = (
+            insert(SavedWord)
+            .values([
+                {
+                    "user_id": user_id,
+                    "word": item.word,
+                    "translation": item.translation,
+                    "context_sentence": item.context_sentence,
+                    "language": language,
+                }
+                for item in unique.values()
+            ])
+            .on_conflict_do_nothing(index_elements=["user_id", "word"])
+            .returning(SavedWord)
+        )
+        inserted = {row.word: row for row in (await db.execute(stmt)).scalars().all()}
+        if inserted:
+            await bump_versions(db, user_id, VOCABULARY)
+        await db.commit()
+
+    results = []
+    for item in items:
+        row = inserted.pop(item.word, None)
+        results.append(("created", row) if row is not None else ("duplicate", None))
+    return results
+
+def _require_language(current_user: CurrentUser) -> None:
+    if not current_user.target_language:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User has no target language set"
+        )
+
 @router.post("/save", response_model=SavedWordResponse, status_code=status.HTTP_201_CREATED)
 async def save_word(
     request: SaveWordRequest,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Save a word to user's vocabulary list.
     """
-    if not current_user.target_language:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User has no target language set"
-        )
+    _require_language(current_user)
     
-    # Check if word already exists for this user
-    existing = db.query(SavedWord).filter(
-        SavedWord.user_id == current_user.id,
-        SavedWord.word == request.word
-    ).first()
+    [(outcome, saved_word)] = await save_words(db, current_user.id, current_user.target_language, [request])
     
-    if existing:
+    if outcome == "duplicate":
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Word already saved"
         )
     
-    saved_word = SavedWord(
-        user_id=current_user.id,
-        word=request.word,
-        translation=request.translation,
-        context_sentence=request.context_sentence,
-        language=current_user.target_language
-    )
+    return saved_word
+
+@router.post("/save/bulk", response_model=SaveWordsResponse)
+async def save_words_bulk(
+    request: SaveWordsRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Save many words in one request. Words that are already saved (or
+    repeated in the request) are reported as duplicates instead of failing.
+    """
+    _require_language(current_user)
     
-    db.add(saved_word)
-    db.commit()
-    db.refresh(saved_word)
+    outcomes = await save_words(db, current_user.id, current_user.target_language, request.words)
+    results = [
+        SaveWordResult(word=item.word, status=outcome, id=row.id if row is not None else None)
+        for item, (outcome, row) in zip(request.words, outcomes)
+    ]
+    created = sum(1 for r in results if r.status == "created")
     
-    return saved_word
+    return SaveWordsResponse(created=created, duplicates=len(results) - created, results=results)
 
 @router.get("", response_model=List[SavedWordResponse])
 async def get_saved_words(
+    request: Request,
+    response: Response,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all saved words for the current user.
+    Conditional: a matching If-None-Match gets a 304 without reading the words.
     """
-    words = db.query(SavedWord).filter(
+    etag = make_etag(current_user.id, VOCABULARY, await get_version(db, current_user.id, VOCABULARY))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    words = (await db.execute(select(SavedWord).where(
         SavedWord.user_id == current_user.id
-    ).order_by(SavedWord.created_at.desc()).all()
+    ).order_by(SavedWord.created_at.desc()))).scalars().all()
+    
+    return words
+
+@router.get("/due", response_model=List[SavedWordResponse])
+async def get_due_words(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Words due for review, most overdue first.
+    Read straight off the (user_id, due_at) index, so the cost is one batch.
+    """
+    words = (await db.execute(select(SavedWord).where(
+        SavedWord.user_id == current_user.id,
+        SavedWord.due_at <= func.now()
+    ).order_by(SavedWord.due_at).limit(limit))).scalars().all()
     
     return words
 
+@router.post("/review", response_model=SavedWordResponse)
+async def review_word(
+    request: ReviewWordRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Grade a review of a saved word and reschedule it (SM-2).
+    """
+    word = (await db.execute(select(SavedWord).where(
+        SavedWord.id == request.word_id,
+        SavedWord.user_id == current_user.id
+    ).with_for_update())).scalar_one_or_none()
+    
+    if not word:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Word not found"
+        )
+    
+    state = schedule(ReviewState(word.interval_days, word.ease, word.repetitions), request.grade)
+    now = datetime.now(timezone.utc)
+    word.interval_days = state.interval_days
+    word.ease = state.ease
+    word.repetitions = state.repetitions
+    word.last_reviewed_at = now
+    word.due_at = next_due(now, state)
+    await bump_versions(db, current_user.id, VOCABULARY)
+    
+    await db.commit()
+    
+    return word
+
 @router.delete("/{word_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_saved_word(
     word_id: int,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a saved word.
     """
-    word = db.query(SavedWord).filter(
+    word = (await db.execute(select(SavedWord).where(
         SavedWord.id == word_id,
         SavedWord.user_id == current_user.id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not word:
         raise HTTPException(
@@ -84,7 +200,8 @@ async def delete_saved_word(
             detail="Word not found"
         )
     
-    db.delete(word)
-    db.commit()
+    await db.delete(word)
+    await bump_versions(db, current_user.id, VOCABULARY)
+    await db.commit()
     
     return None
@@ -0,0 +1,113 @@
+"""Audio container helpers: format sniffing and WAV/PCM packing."""
+
+import io
+import re
+import wave
+from typing import List, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (sample_rate, channels, sample_width_bytes)
+PcmParams = Tuple[int, int, int]
+
+
+EXTENSIONS = {
+    "audio/wav": "wav",
+    "audio/mpeg": "mp3",
+    "audio/ogg": "ogg",
+    "audio/aac": "aac",
+    "audio/mp4": "m4a",
+    "audio/webm": "webm",
+}
+
+
+def is_wav(data: bytes) -> bool:
+    return data[:4] == b"RIFF" and data[8:12] == b"WAVE"
+
+
+def sniff_content_type(data: bytes, default: str = "audio/mpeg") -> str:
+    """Detect the audio container from its magic bytes."""
+    if is_wav(data):
+        return "audio/wav"
+    if data[:4] == b"OggS":
+        return "audio/ogg"
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        return "audio/webm"
+    if data[4:8] == b"ftyp":
+        return "audio/mp4"
+    if data[:3] == b"ID3":
+        return "audio/mpeg"
+    if len(data) > 1 and data[0] == 0xFF:
+        # ADTS (AAC) sync words are 0xFFF1/0xFFF9; other frame syncs are MPEG audio
+        return "audio/aac" if data[1] & 0xF6 == 0xF0 else "audio/mpeg"
+    return default
+
+
+def extension_for(content_type: str, default: str = "bin") -> str:
+    return EXTENSIONS.get(content_type.split(";")[0].strip(), default)
+
+
+def pcm_rate_from_mime(mime_type: str, default: int = 24000) -> int:
+    """Read the sample rate from a mime type such as 'audio/L16;codec=pcm;rate=24000'."""
+    match = re.search(r"rate=(\d+)", mime_type or "")
+    return int(match.group(1)) if match else default
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = 24000, channels: int = 1, sample_width: int = 2) -> bytes:
+    """Wrap raw little-endian PCM in a WAV container."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(sample_width)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+def wav_to_pcm(data: bytes) -> Tuple[bytes, PcmParams]:
+    """Unpack a WAV file into raw PCM frames and its format parameters."""
+    with wave.open(io.BytesIO(data), "rb") as w:
+        params = (w.getframerate(), w.getnchannels(), w.getsampwidth())
+        return w.readframes(w.getnframes()), params
+
+
+# Containers made of self-contained frames: same-format files stay playable when byte-joined
+FRAMED_CONTENT_TYPES = {"audio/mpeg", "audio/aac"}
+
+
+def concat_audio(segments: List[bytes]) -> Optional[bytes]:
+    """
+    Join audio segments in order into a single playable file.
+
+    WAV segments sharing the same format are merged into one WAV, and
+    frame-based files of one type (MP3, ADTS) are byte-concatenated.
+    Returns None when the segments don't share a mergeable format (mixed
+    containers or WAV parameters, e.g. after a provider fallback): joining
+    whole files back to back only plays the first one.
+    """
+    segments = [s for s in segments if s]
+    if len(segments) <= 1:
+        return segments[0] if segments else b""
+
+    if all(is_wav(s) for s in segments):
+        frames = []
+        params: Optional[PcmParams] = None
+        try:
+            for s in segments:
+                pcm, p = wav_to_pcm(s)
+                if params is None:
+                    params = p
+                elif p != params:
+                    logger.info("WAV segments differ in format (%s != %s)", p, params)
+                    return None
+                frames.append(pcm)
+        except (wave.Error, EOFError) as e:
+            logger.warning("Could not read WAV segment: %s", e)
+            return None
+        return pcm_to_wav(b"".join(frames), *params)
+
+    types = {sniff_content_type(s, default="") for s in segments}
+    if len(types) == 1 and types <= FRAMED_CONTENT_TYPES:
+        return b"".join(segments)
+    return None
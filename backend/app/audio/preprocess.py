@@ -0,0 +1,151 @@
+"""Normalize uploaded speech before it is sent to the model: mono 16 kHz, silence trimmed, compact codec."""
+
+import asyncio
+import os
+import tempfile
+import time
+from typing import Tuple
+import numpy as np
+from app.audio.formats import pcm_to_wav, sniff_content_type
+from app.audio.transcode import ffmpeg_path, run_ffmpeg
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.stats import register_stats
+
+logger = get_logger(__name__)
+
+_stats = {"processed": 0, "skipped": 0, "failed": 0, "bytes_in": 0, "bytes_out": 0, "seconds_trimmed": 0.0}
+
+
+def _write_temp(data: bytes, suffix: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+
+async def decode_to_pcm(data: bytes, sample_rate: int) -> np.ndarray:
+    """Decode any ffmpeg-readable upload to mono signed 16-bit samples at `sample_rate`."""
+    output_args = ["-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "pipe:1"]
+    timeout = settings.AUDIO_TRANSCODE_TIMEOUT_SECONDS
+    if sniff_content_type(data, default="") != "audio/mp4":
+        args = [ffmpeg_path(), "-hide_banner", "-loglevel", "error", "-i", "pipe:0", *output_args]
+        pcm = await run_ffmpeg(args, data, timeout)
+    else:
+        # MP4 recordings (Safari) usually keep the index at the end, which needs a seekable input.
+        # File I/O runs in a thread so large uploads don't stall the event loop
+        path = await asyncio.to_thread(_write_temp, data, ".m4a")
+        try:
+            args = [ffmpeg_path(), "-hide_banner", "-loglevel", "error", "-i", path, *output_args]
+            pcm = await run_ffmpeg(args, b"", timeout)
+        finally:
+            await asyncio.to_thread(os.unlink, path)
+    return np.frombuffer(pcm, dtype="<i2")
+
+
+def trim_silence(
+    samples: np.ndarray,
+    sample_rate: int,
+    frame_ms: int = 20,
+    threshold_db: float = -45.0,
+    relative_db: float = 35.0,
+    pad_ms: int = 200,
+) -> np.ndarray:
+    """
+    Cut leading and trailing silence with a frame-energy VAD.
+
+    A frame counts as speech when its RMS level is above `threshold_db`
+    dBFS and within `relative_db` of the loudest frame. `pad_ms` of audio
+    is kept on both sides of the speech. Recordings with no speech frame
+    are returned unchanged.
+    """
+    frame_len = max(1, sample_rate * frame_ms // 1000)
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return samples
+
+    frames = samples[: n_frames * frame_len].astype(np.float32).reshape(n_frames, frame_len) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    level_db = 20 * np.log10(np.maximum(rms, 1e-10))
+    voiced = np.flatnonzero(level_db > max(threshold_db, level_db.max() - relative_db))
+    if voiced.size == 0:
+        return samples
+
+    pad = sample_rate * pad_ms // 1000
+    start = max(0, voiced[0] * frame_len - pad)
+    end = min(len(samples), (voiced[-1] + 1) * frame_len + pad)
+    return samples[start:end]
+
+
+async def encode_pcm(samples: np.ndarray, sample_rate: int) -> Tuple[bytes, str]:
+    """Encode mono PCM as Opus (or WAV when AUDIO_INPUT_CODEC is "wav")."""
+    wav = pcm_to_wav(samples.astype("<i2").tobytes(), sample_rate=sample_rate)
+    if settings.AUDIO_INPUT_CODEC == "wav":
+        return wav, "audio/wav"
+    args = [
+        ffmpeg_path(), "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-c:a", "libopus", "-application", "voip", "-b:a", settings.AUDIO_INPUT_BITRATE,
+        "-f", "ogg", "pipe:1",
+    ]
+    return await run_ffmpeg(args, wav, settings.AUDIO_TRANSCODE_TIMEOUT_SECONDS), "audio/ogg"
+
+
+async def preprocess_upload(data: bytes, mime_type: str) -> Tuple[bytes, str]:
+    """
+    Decode, downmix, resample, trim and re-encode an uploaded recording.
+
+    Returns (audio bytes, mime type) for the model. The upload is returned
+    unchanged when preprocessing is disabled, ffmpeg is unavailable, or
+    any stage fails.
+    """
+    if not settings.AUDIO_PREPROCESS_ENABLED or not data or ffmpeg_path() is None:
+        _stats["skipped"] += 1
+        return data, mime_type
+
+    rate = settings.AUDIO_INPUT_SAMPLE_RATE
+    t0 = time.perf_counter()
+    try:
+        samples = await decode_to_pcm(data, rate)
+        t_decode = time.perf_counter()
+        trimmed = await asyncio.to_thread(
+            trim_silence,
+            samples,
+            rate,
+            settings.AUDIO_VAD_FRAME_MS,
+            settings.AUDIO_VAD_THRESHOLD_DB,
+            settings.AUDIO_VAD_RELATIVE_DB,
+            settings.AUDIO_VAD_PAD_MS,
+        )
+        t_trim = time.perf_counter()
+        if trimmed.size == 0:
+            _stats["skipped"] += 1
+            return data, mime_type
+        encoded, encoded_mime = await encode_pcm(trimmed, rate)
+        t_encode = time.perf_counter()
+    except Exception as e:
+        _stats["failed"] += 1
+        logger.warning("Audio preprocessing failed (%s); sending the upload as-is: %s", mime_type, e)
+        return data, mime_type
+
+    if not encoded or len(encoded) >= len(data):
+        _stats["skipped"] += 1
+        return data, mime_type
+
+    duration_in = len(samples) / rate
+    duration_out = len(trimmed) / rate
+    _stats["processed"] += 1
+    _stats["bytes_in"] += len(data)
+    _stats["bytes_out"] += len(encoded)
+    _stats["seconds_trimmed"] += duration_in - duration_out
+    logger.info(
+        "Input audio: upload %s bytes (%s) -> decode %s bytes %.2fs [%.0fms] -> trim %.2fs [%.0fms] -> %s %s bytes [%.0fms]",
+        len(data), mime_type,
+        samples.nbytes, duration_in, (t_decode - t0) * 1000,
+        duration_out, (t_trim - t_decode) * 1000,
+        encoded_mime, len(encoded), (t_encode - t_trim) * 1000,
+    )
+    return encoded, encoded_mime
+
+
+register_stats("audio_preprocess", lambda: dict(_stats))
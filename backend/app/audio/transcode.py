@@ -0,0 +1,96 @@
+"""Encode synthesized speech to a compact delivery codec with ffmpeg."""
+
+import asyncio
+import shutil
+from functools import lru_cache
+from typing import Optional, Tuple
+from app.audio.formats import sniff_content_type
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.stats import register_stats
+
+logger = get_logger(__name__)
+
+# codec -> (ffmpeg encoder args, output muxer, content type)
+CODECS = {
+    "opus": (["-c:a", "libopus", "-application", "voip"], "ogg", "audio/ogg"),
+    "aac": (["-c:a", "aac"], "adts", "audio/aac"),
+}
+
+_stats = {"encoded": 0, "passthrough": 0, "failed": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+@lru_cache()
+def ffmpeg_path() -> Optional[str]:
+    """Resolved ffmpeg binary, or None if it is not installed."""
+    path = shutil.which(settings.FFMPEG_PATH)
+    if path is None:
+        logger.warning("ffmpeg not found (%s); audio is sent in its original format", settings.FFMPEG_PATH)
+    return path
+
+
+async def run_ffmpeg(args: list, data: bytes, timeout: float) -> bytes:
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(data), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise RuntimeError(err.decode("utf-8", "replace").strip()[-300:] or f"exit code {proc.returncode}")
+    return out
+
+
+async def transcode(
+    data: bytes,
+    codec: Optional[str] = None,
+    bitrate: Optional[str] = None,
+) -> Tuple[bytes, str]:
+    """
+    Re-encode audio to the delivery codec (AUDIO_OUTPUT_CODEC by default).
+
+    Returns (audio bytes, content type). On any problem (codec "none",
+    ffmpeg missing or failing, output not smaller) the input is returned
+    unchanged with its sniffed content type.
+    """
+    codec = codec or settings.AUDIO_OUTPUT_CODEC
+    original = (data, sniff_content_type(data))
+    if not data or codec not in CODECS or original[1] == CODECS[codec][2]:
+        return original
+    ffmpeg = ffmpeg_path()
+    if ffmpeg is None:
+        _stats["passthrough"] += 1
+        return original
+
+    encoder_args, muxer, content_type = CODECS[codec]
+    args = [
+        ffmpeg, "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-vn", "-ac", "1",
+        *encoder_args,
+        "-b:a", bitrate or settings.AUDIO_OUTPUT_BITRATE,
+        "-f", muxer, "pipe:1",
+    ]
+    try:
+        encoded = await run_ffmpeg(args, data, settings.AUDIO_TRANSCODE_TIMEOUT_SECONDS)
+    except Exception as e:
+        _stats["failed"] += 1
+        logger.warning("Audio transcode to %s failed: %s", codec, e or type(e).__name__)
+        return original
+
+    if not encoded or len(encoded) >= len(data):
+        _stats["passthrough"] += 1
+        return original
+    _stats["encoded"] += 1
+    _stats["bytes_in"] += len(data)
+    _stats["bytes_out"] += len(encoded)
+    return encoded, content_type
+
+
+register_stats("audio_transcode", lambda: dict(_stats))
@@ -1,25 +1,100 @@
+import hashlib
+import hmac
+import time
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
+from app.core.stats import register_stats
+from app.core.ttl_cache import TTLCache
 from app.db.session import get_db
 from app.models.user import Profile
 
 security = HTTPBearer()
+ops_security = HTTPBearer(auto_error=False)
+
+# sha256(token) -> (user_id, email), kept until min(token exp, TTL)
+claims_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CLAIMS_CACHE_TTL_SECONDS)
+# user_id -> CurrentUser; the TTL bounds staleness across API instances
+profile_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_PROFILE_CACHE_TTL_SECONDS)
 
 class CurrentUser:
-    """Current authenticated user context."""
+    """Current authenticated user context (plain values, safe to share between requests)."""
     def __init__(self, user: Profile):
-        self.user = user
         self.id = user.id
         self.email = user.email
         self.target_language = user.target_language
         self.proficiency_level = user.proficiency_level
+        self.created_at = user.created_at
+
+def require_ops_token(credentials: HTTPAuthorizationCredentials | None = Depends(ops_security)) -> None:
+    """Guard internal endpoints (/metrics, /statz) with OPS_TOKEN; hidden entirely when it is unset."""
+    if not settings.OPS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), settings.OPS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid ops token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+def invalidate_user(user_id: str) -> None:
+    """Drop the cached profile after it changes."""
+    profile_cache.invalidate(user_id)
+
+def _verify_token(token: str) -> tuple[str, str]:
+    """Return (user_id, email) for a valid token, from the cache when it was verified before."""
+    key = hashlib.sha256(token.encode()).digest()
+    claims = claims_cache.get(key)
+    if claims is not None:
+        return claims
+
+    # Decode JWT using Supabase JWT secret
+    payload = jwt.decode(
+        token,
+        settings.SUPABASE_JWT_SECRET,
+        algorithms=["HS256"],
+        audience="authenticated"
+    )
+
+    user_id: str = payload.get("sub")
+    email: str = payload.get("email")
+
+    if not user_id or not email:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token"
+        )
+
+    exp = payload.get("exp")
+    claims_cache.set(key, (user_id, email), None if exp is None else exp - time.time())
+    return user_id, email
+
+async def _load_profile(db: AsyncSession, user_id: str, email: str) -> CurrentUser:
+    """Get or create the user's profile row."""
+    result = await db.execute(select(Profile).where(Profile.id == user_id))
+    user = result.scalar_one_or_none()
+
+    if not user:
+        # First login; concurrent first requests may race, so let the
+        # insert lose quietly and read back whichever row won
+        await db.execute(insert(Profile).values(id=user_id, email=email).on_conflict_do_nothing())
+        await db.commit()
+        user = (await db.execute(select(Profile).where(Profile.id == user_id))).scalar_one_or_none()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not create user profile"
+            )
+
+    return CurrentUser(user)
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> CurrentUser:
     """
     Verify JWT token from Supabase and return current user.
@@ -30,40 +105,20 @@ async def get_current_user(
     token = credentials.credentials
     
     try:
-        # Decode JWT using Supabase JWT secret
-        payload = jwt.decode(
-            token,
-            settings.SUPABASE_JWT_SECRET,
-            algorithms=["HS256"],
-            audience="authenticated"
-        )
-        
-        user_id: str = payload.get("sub")
-        email: str = payload.get("email")
-        
-        if not user_id or not email:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication token"
-            )
-        
-        # Get or create user in our database
-        user = db.query(Profile).filter(Profile.id == user_id).first()
-        
-        if not user:
-            # Create user if doesn't exist (first login)
-            user = Profile(id=user_id, email=email)
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        
-        return CurrentUser(user)
+        user_id, email = _verify_token(token)
+        current_user = profile_cache.get(user_id)
+        if current_user is None:
+            current_user = await _load_profile(db, user_id, email)
+            profile_cache.set(user_id, current_user)
+        return current_user
         
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired"
         )
+    except HTTPException:
+        raise
     except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -74,3 +129,6 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Authentication failed: {str(e)}"
         )
+
+
+register_stats("auth_cache", lambda: {"claims": claims_cache.stats(), "profiles": profile_cache.stats()})
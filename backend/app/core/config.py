@@ -5,17 +5,115 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: str
     YARNGPT_API_KEY: str
     DATABASE_URL: str
+    # Async connection pool used by the API (scripts keep a plain sync engine)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
     CORS_ALLOW_ORIGINS: list[str] = ["*"]
     LOG_LEVEL: str = "INFO"
+    # Bearer token required by /metrics and /statz; both answer 404 when unset
+    OPS_TOKEN: str | None = None
+    # Per-stage timings in a Server-Timing response header (metrics are always on, at /metrics)
+    SERVER_TIMING_ENABLED: bool = True
+    # Request profiler (app/core/profiling.py, pyinstrument):
+    # requests with `X-Profile: <PROFILER_TOKEN>` or a PROFILER_SAMPLE_RATE share are profiled
+    PROFILER_TOKEN: str | None = None
+    PROFILER_SAMPLE_RATE: float = 0.0
+    PROFILER_INTERVAL_SECONDS: float = 0.001
+    PROFILER_OUTPUT_DIR: str = "/tmp/talknative-profiles"
+    PROFILER_KEEP_REPORTS: int = 200
     
+    # Build every (language, model) agent at startup instead of on first use
+    AI_AGENT_PREWARM: bool = True
+
+    # Hedged model calls: start the next candidate model in parallel when the
+    # current one is slower than the hedge delay (or its observed percentile)
+    AI_HEDGE_ENABLED: bool = False
+    AI_HEDGE_DELAY_SECONDS: float = 4.0
+    AI_HEDGE_MIN_DELAY_SECONDS: float = 1.5
+    AI_HEDGE_PERCENTILE: float = 95.0
+
+    # Outbound HTTP client pool (one keep-alive pool per provider host).
+    # HTTP/2 requires the optional 'h2' package (httpx[http2]).
+    HTTP2_ENABLED: bool = False
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_MAX_KEEPALIVE_PER_HOST: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+
+    # Provider-side caching of compiled scenario prompts: "none", "gemini" or "fake" (tests)
+    PROMPT_CACHE_PROVIDER: Literal["none", "gemini", "fake"] = "none"
+    PROMPT_CACHE_TTL_SECONDS: int = 3600
+    PROMPT_CACHE_MIN_TOKENS: int = 1024
+
+    # Recent-turn cache used to build message history without a DB read per turn
+    TURN_CACHE_MAX_CONVERSATIONS: int = 2048
+    TURN_CACHE_WINDOW: int = 6
+    TURN_CACHE_TTL_SECONDS: float = 1800.0
+
+    # Auth fast path: verified-token claims (also capped by the token's exp) and profiles
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CLAIMS_CACHE_TTL_SECONDS: float = 300.0
+    AUTH_PROFILE_CACHE_TTL_SECONDS: float = 60.0
+
+    # Turn persistence outbox (app/workers/outbox_worker.py); disable the in-process
+    # runner when a separate `python -m app.workers.outbox_worker` is deployed
+    OUTBOX_WORKER_IN_PROCESS: bool = True
+    OUTBOX_BATCH_SIZE: int = 20
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_LEASE_SECONDS: int = 120
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_BASE_SECONDS: float = 2.0
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 300.0
+    OUTBOX_DRAIN_TIMEOUT_SECONDS: float = 20.0
+
+    # Scenario/proverb JSON is polled for changes and hot-reloaded; 0 disables the watcher
+    CONTENT_RELOAD_INTERVAL_SECONDS: float = 5.0
+
+    # Opening greetings (see scripts/build_greetings.py); defaults to app/data/greetings
+    GREETING_STORE_DIR: str | None = None
+    GREETING_GENERATE_ON_MISS: bool = True
+
     TTS_PROVIDER: Literal["yarngpt", "gemini"] = "yarngpt"
-    
+    # Sentence-level TTS pipeline
+    TTS_PIPELINE_ENABLED: bool = True
+    TTS_SEGMENT_CONCURRENCY: int = 3
+    TTS_SEGMENT_MIN_CHARS: int = 24
+    TTS_SEGMENT_MAX_CHARS: int = 240
+    # Synthesized audio cache (memory LRU + optional disk tier; empty dir disables disk)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_MEMORY_MB: int = 64
+    TTS_CACHE_DIR: str = "/tmp/talknative-tts-cache"
+    TTS_CACHE_DISK_MB: int = 256
+    # Delivery codec for synthesized audio (needs ffmpeg; "none" sends provider output as-is).
+    # "opus" -> audio/ogg, "aac" -> audio/aac (ADTS, for older Safari)
+    AUDIO_OUTPUT_CODEC: Literal["none", "opus", "aac"] = "opus"
+    AUDIO_OUTPUT_BITRATE: str = "24k"
+    FFMPEG_PATH: str = "ffmpeg"
+    AUDIO_TRANSCODE_TIMEOUT_SECONDS: float = 10.0
+    # Uploaded speech sent to the model: mono, resampled, silence-trimmed (energy VAD), re-encoded
+    AUDIO_PREPROCESS_ENABLED: bool = True
+    AUDIO_INPUT_SAMPLE_RATE: int = 16000
+    AUDIO_INPUT_CODEC: Literal["opus", "wav"] = "opus"
+    AUDIO_INPUT_BITRATE: str = "16k"
+    AUDIO_VAD_FRAME_MS: int = 20
+    AUDIO_VAD_THRESHOLD_DB: float = -45.0
+    AUDIO_VAD_RELATIVE_DB: float = 35.0
+    AUDIO_VAD_PAD_MS: int = 200
+
     # Supabase configuration
     SUPABASE_URL: str
     SUPABASE_SERVICE_KEY: str
     SUPABASE_JWT_SECRET: str
     SUPABASE_BUCKET_NAME: str = "chat-audio"
 
+    # Audio storage backend; "local" writes under LOCAL_STORAGE_DIR, served at LOCAL_STORAGE_BASE_URL
+    STORAGE_BACKEND: Literal["supabase", "local"] = "supabase"
+    STORAGE_UPLOAD_CONCURRENCY: int = 4
+    LOCAL_STORAGE_DIR: str = "/tmp/talknative-media"
+    LOCAL_STORAGE_BASE_URL: str = "/media"
+
     model_config = {
         "env_file": ".env",
         "extra": "ignore",
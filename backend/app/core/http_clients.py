@@ -0,0 +1,120 @@
+"""Shared outbound HTTP and GenAI clients, created once per process and closed on shutdown."""
+
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+import httpx
+from google import genai
+from google.genai import types
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.stats import register_stats
+
+logger = get_logger(__name__)
+
+YARNGPT_HOST = "yarngpt.ai"
+GEMINI_HOST = "generativelanguage.googleapis.com"
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Wrap a transport to count requests, errors and latency for one host."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, metrics: dict):
+        self._inner = inner
+        self._metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        self._metrics["requests"] += 1
+        try:
+            response = await self._inner.handle_async_request(request)
+        except Exception:
+            self._metrics["errors"] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._metrics["seconds_total"] += elapsed
+            self._metrics["seconds_max"] = max(self._metrics["seconds_max"], elapsed)
+        if response.status_code >= 500:
+            self._metrics["status_5xx"] += 1
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ClientPool:
+    """
+    Keep-alive clients for every outbound provider.
+
+    One `httpx.AsyncClient` per host (so connection limits apply per host)
+    and one `genai.Client` that reuses the Gemini host's pooled connections.
+    The FastAPI lifespan calls `startup`/`shutdown`; clients are also created
+    lazily so scripts can use providers without the app running.
+    """
+
+    def __init__(self):
+        self._http: Dict[str, httpx.AsyncClient] = {}
+        self._genai: Optional[genai.Client] = None
+        self._metrics: Dict[str, dict] = defaultdict(
+            lambda: {"requests": 0, "errors": 0, "status_5xx": 0, "seconds_total": 0.0, "seconds_max": 0.0}
+        )
+
+    def http(self, host: str) -> httpx.AsyncClient:
+        client = self._http.get(host)
+        if client is None or client.is_closed:
+            http2 = settings.HTTP2_ENABLED and _http2_available()
+            if settings.HTTP2_ENABLED and not http2:
+                logger.warning("HTTP2_ENABLED is set but the 'h2' package is not installed; using HTTP/1.1")
+            limits = httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_PER_HOST,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            )
+            transport = _MeteredTransport(
+                httpx.AsyncHTTPTransport(http2=http2, limits=limits, retries=1),
+                self._metrics[host],
+            )
+            client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(120.0, connect=5.0),
+            )
+            self._http[host] = client
+        return client
+
+    def genai(self) -> genai.Client:
+        if self._genai is None:
+            self._genai = genai.Client(
+                api_key=settings.GOOGLE_API_KEY,
+                http_options=types.HttpOptions(httpx_async_client=self.http(GEMINI_HOST)),
+            )
+        return self._genai
+
+    async def startup(self) -> None:
+        self.http(YARNGPT_HOST)
+        self.genai()
+        logger.info("Outbound client pool ready (%s hosts)", len(self._http))
+
+    async def shutdown(self) -> None:
+        self._genai = None
+        for host, client in list(self._http.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("Error closing HTTP client for %s: %s", host, e)
+        self._http.clear()
+
+    def stats(self) -> dict:
+        return {host: dict(m) for host, m in self._metrics.items()}
+
+
+client_pool = ClientPool()
+register_stats("http_clients", client_pool.stats)
@@ -0,0 +1,174 @@
+"""
+Prometheus metrics (served at /metrics) and per-request stage timings.
+
+Code times a step with `with stage("history"):`; the duration goes to the
+`talknative_stage_seconds` histogram and, while a request is being
+handled, to that request's `Server-Timing` header (added by
+`MetricsMiddleware`). Stages that finish after the response headers were
+sent (streamed turns, background work) only reach the histograms.
+
+Gauges that mirror other components (DB pool, outbox) are refreshed at
+scrape time by callables registered with `register_gauge_refresher`.
+"""
+
+import inspect
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple, Union
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.datastructures import MutableHeaders
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0)
+
+STAGE_SECONDS = Histogram(
+    "talknative_stage_seconds", "Duration of a request stage", ["stage"], buckets=LATENCY_BUCKETS
+)
+MODEL_ATTEMPT_SECONDS = Histogram(
+    "talknative_model_attempt_seconds", "Duration of one model call", ["model", "outcome"], buckets=LATENCY_BUCKETS
+)
+MODEL_ERRORS = Counter("talknative_model_errors_total", "Failed model calls", ["model", "status"])
+FALLBACKS = Counter(
+    "talknative_fallbacks_total",
+    "Degraded paths taken (next model, hedge, canned reply, other TTS provider, whole-reply TTS retry)",
+    ["kind"],
+)
+TTS_SECONDS = Histogram(
+    "talknative_tts_seconds", "Duration of one TTS provider call", ["provider", "outcome"], buckets=LATENCY_BUCKETS
+)
+STORAGE_SECONDS = Histogram(
+    "talknative_storage_seconds", "Duration of one audio storage call (upload attempt or delete)",
+    ["operation", "backend", "outcome"], buckets=LATENCY_BUCKETS,
+)
+PERSIST_FAILURES = Counter("talknative_persist_failures_total", "Turns that could not be queued for persistence")
+REQUEST_SECONDS = Histogram(
+    "talknative_http_request_seconds", "HTTP request duration (until the handler returns)",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge("talknative_http_requests_in_flight", "HTTP requests being handled")
+DB_POOL_CONNECTIONS = Gauge("talknative_db_pool_connections", "Async DB pool connections", ["state"])
+DB_POOL_TIMEOUTS = Counter("talknative_db_pool_timeouts_total", "DB pool checkouts that timed out")
+OUTBOX_ROWS = Gauge("talknative_outbox_rows", "Turn outbox rows", ["state"])
+OUTBOX_LAG_SECONDS = Gauge("talknative_outbox_lag_seconds", "Age of the oldest pending outbox row")
+
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+_refreshers: List[Callable[[], Union[None, Awaitable[None]]]] = []
+_TOKEN_UNSAFE = re.compile(r"[^A-Za-z0-9!#$%&'*+\-.^_`|~]")
+
+
+class StageTimer:
+    __slots__ = ("seconds",)
+
+    def __init__(self):
+        self.seconds = 0.0
+
+
+def add_timing(name: str, seconds: float) -> None:
+    """Add an entry to the current request's Server-Timing header (no-op outside a request)."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageTimer]:
+    """Time a block as stage `name`; the yielded timer holds the duration afterwards."""
+    timer = StageTimer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.seconds = time.perf_counter() - started
+        STAGE_SECONDS.labels(name).observe(timer.seconds)
+        add_timing(name, timer.seconds)
+
+
+def histogram_snapshot(histogram: Histogram, **labels: str) -> dict:
+    """
+    /statz-style {count, sum, buckets} view of a Prometheus histogram,
+    summed over the series matching `labels`.
+    """
+    count, total, buckets = 0.0, 0.0, {}
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            if any(sample.labels.get(k) != v for k, v in labels.items()):
+                continue
+            if sample.name.endswith("_bucket"):
+                le = sample.labels["le"]
+                key = "+Inf" if le == "+Inf" else str(float(le))
+                buckets[key] = buckets.get(key, 0) + int(sample.value)
+            elif sample.name.endswith("_count"):
+                count += sample.value
+            elif sample.name.endswith("_sum"):
+                total += sample.value
+    return {"count": int(count), "sum": round(total, 4), "buckets": buckets}
+
+
+def server_timing_header(timings: List[Tuple[str, float]], total: float) -> str:
+    entries = [f"{_TOKEN_UNSAFE.sub('_', name)};dur={seconds * 1000:.1f}" for name, seconds in timings]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def register_gauge_refresher(fn: Callable[[], Union[None, Awaitable[None]]]) -> None:
+    """Register a (sync or async) callable that updates gauges before each scrape."""
+    _refreshers.append(fn)
+
+
+async def render_metrics() -> Tuple[bytes, str]:
+    """Refresh the mirrored gauges and render the exposition text."""
+    for refresh in _refreshers:
+        try:
+            result = refresh()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning("Metrics refresher %s failed: %s", getattr(refresh, "__name__", refresh), e)
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: request duration/in-flight metrics and the
+    Server-Timing header built from the stages recorded while handling it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: List[Tuple[str, float]] = []
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", server_timing_header(timings, time.perf_counter() - started)
+                    )
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            _request_timings.reset(token)
+            # Route template, not the raw path, to keep label cardinality bounded
+            route = scope.get("route")
+            REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status_code)
+            ).observe(time.perf_counter() - started)
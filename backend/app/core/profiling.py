@@ -0,0 +1,140 @@
+"""
+On-demand request profiling with pyinstrument.
+
+A request is profiled when it carries `X-Profile: <PROFILER_TOKEN>` or is
+picked by PROFILER_SAMPLE_RATE. The report is written as HTML under
+PROFILER_OUTPUT_DIR and named in the `X-Profile-Id` response header;
+token-authorized requests may add `X-Profile-Output: html` or `text` to get
+the report back instead of the normal response body. pyinstrument's async
+mode attributes time spent awaiting (DB, providers) to the awaiting frame.
+
+main.py only installs the middleware when profiling is configured, so a
+disabled profiler costs nothing. One request is profiled at a time; others
+arriving meanwhile run unprofiled.
+"""
+
+import asyncio
+import hmac
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+from pyinstrument import Profiler
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.stats import register_stats
+
+logger = get_logger(__name__)
+
+INLINE_FORMATS = {"html": "text/html; charset=utf-8", "text": "text/plain; charset=utf-8"}
+# Never sampled (still profiled on an explicit header)
+UNSAMPLED_PATHS = {"/healthz", "/metrics", "/statz"}
+
+_stats = {"profiled": 0, "stored": 0, "inline": 0, "skipped_busy": 0, "rejected_token": 0, "store_failures": 0}
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _store_report(directory: Path, name: str, html: str, keep: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{name}.html").write_text(html, encoding="utf-8")
+    # Keep the newest `keep` reports; names start with a timestamp
+    reports = sorted(directory.glob("*.html"))
+    for old in reports[: max(0, len(reports) - keep)]:
+        old.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that runs selected requests under a sampling profiler."""
+
+    def __init__(self, app):
+        self.app = app
+        self.token = settings.PROFILER_TOKEN or None
+        self.sample_rate = settings.PROFILER_SAMPLE_RATE
+        self.output_dir = Path(settings.PROFILER_OUTPUT_DIR)
+        self._busy = False
+
+    def _mode(self, scope) -> Optional[str]:
+        """Return "store", an inline format, or None when the request is not profiled."""
+        supplied = _header(scope, b"x-profile")
+        if supplied is not None:
+            if self.token and hmac.compare_digest(supplied.encode(), self.token.encode()):
+                output = (_header(scope, b"x-profile-output") or "").lower()
+                return output if output in INLINE_FORMATS else "store"
+            _stats["rejected_token"] += 1
+        if self.sample_rate > 0 and scope["path"] not in UNSAMPLED_PATHS and random.random() < self.sample_rate:
+            return "store"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        mode = self._mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if self._busy:
+            _stats["skipped_busy"] += 1
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        inline = mode in INLINE_FORMATS
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", name.encode())]
+            await send(message)
+
+        async def discard(message):
+            # Inline reports replace the response; the handler's own output is dropped
+            pass
+
+        profiler = Profiler(interval=settings.PROFILER_INTERVAL_SECONDS, async_mode="enabled")
+        self._busy = True
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard if inline else send_with_id)
+        finally:
+            profiler.stop()
+            self._busy = False
+            _stats["profiled"] += 1
+            route = getattr(scope.get("route"), "path", scope["path"])
+            logger.info(
+                "Profiled %s %s in %.0fms (%s)", scope["method"], route, (time.perf_counter() - started) * 1000,
+                mode if inline else name,
+            )
+
+        if inline:
+            _stats["inline"] += 1
+            body = (profiler.output_html() if mode == "html" else profiler.output_text(unicode=True)).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", INLINE_FORMATS[mode].encode()),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"cache-control", b"no-store"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        try:
+            html = profiler.output_html()
+            await asyncio.to_thread(_store_report, self.output_dir, name, html, settings.PROFILER_KEEP_REPORTS)
+            _stats["stored"] += 1
+        except Exception as e:
+            _stats["store_failures"] += 1
+            logger.warning("Could not store profile %s: %s", name, e)
+
+
+register_stats("profiler", lambda: dict(_stats))
@@ -0,0 +1,36 @@
+"""
+Per-user version counters for read-mostly resources.
+
+Write paths bump a resource's counter in the same transaction as the
+change; read endpoints derive their ETag from it, so a conditional GET is
+answered with one primary-key lookup and no reads of the resource rows.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.resource_version import UserResourceVersion
+
+PROGRESS = "progress"
+DECK = "deck"
+VOCABULARY = "vocabulary"
+
+
+async def bump_versions(db: AsyncSession, user_id: str, *resources: str) -> None:
+    """Increment the counters (uncommitted); the caller commits with its own changes."""
+    # Fixed order, so concurrent writers lock the rows in the same sequence
+    for resource in sorted(set(resources)):
+        stmt = insert(UserResourceVersion).values(user_id=user_id, resource=resource, version=1)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id", "resource"],
+            set_={"version": UserResourceVersion.version + 1, "updated_at": func.now()},
+        ))
+
+
+async def get_version(db: AsyncSession, user_id: str, resource: str) -> int:
+    """Current counter; 0 for a resource that was never written."""
+    version = (await db.execute(select(UserResourceVersion.version).where(
+        UserResourceVersion.user_id == user_id,
+        UserResourceVersion.resource == resource,
+    ))).scalar_one_or_none()
+    return version or 0
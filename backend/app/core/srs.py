@@ -0,0 +1,40 @@
+"""SM-2 spaced-repetition scheduling for saved words."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+MIN_EASE = 1.3
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    interval_days: int
+    ease: float
+    repetitions: int
+
+
+def schedule(state: ReviewState, grade: int) -> ReviewState:
+    """
+    Next SM-2 state after a review graded 0 (blackout) to 5 (perfect).
+
+    Grades below 3 restart the word at a one day interval; the ease factor
+    is adjusted on every review and never drops below 1.3.
+    """
+    if grade >= 3:
+        if state.repetitions == 0:
+            interval = 1
+        elif state.repetitions == 1:
+            interval = 6
+        else:
+            interval = round(state.interval_days * state.ease)
+        repetitions = state.repetitions + 1
+    else:
+        interval = 1
+        repetitions = 0
+    miss = 5 - grade
+    ease = max(MIN_EASE, state.ease + 0.1 - miss * (0.08 + miss * 0.02))
+    return ReviewState(interval_days=interval, ease=round(ease, 3), repetitions=repetitions)
+
+
+def next_due(reviewed_at: datetime, state: ReviewState) -> datetime:
+    return reviewed_at + timedelta(days=state.interval_days)
@@ -0,0 +1,53 @@
+"""In-process stats registry: components register a snapshot callable, /statz reports them all."""
+
+import bisect
+import inspect
+from typing import Awaitable, Callable, Dict, Sequence, Union
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_providers: Dict[str, Callable[[], Union[dict, Awaitable[dict]]]] = {}
+
+
+def register_stats(name: str, provider: Callable[[], Union[dict, Awaitable[dict]]]) -> None:
+    """Register (or replace) a named stats snapshot provider."""
+    _providers[name] = provider
+
+
+async def collect_stats() -> Dict[str, dict]:
+    """Snapshot every provider; providers may be sync or async callables."""
+    snapshot = {}
+    for name, provider in _providers.items():
+        try:
+            value = provider()
+            if inspect.isawaitable(value):
+                value = await value
+            snapshot[name] = value
+        except Exception as e:
+            logger.warning("Stats provider %s failed: %s", name, e)
+    return snapshot
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative counts, Prometheus style)."""
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, n in zip(self.buckets + (float("inf"),), self._counts):
+            cumulative += n
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"count": self.count, "sum": round(self.sum, 4), "buckets": buckets}
@@ -1,19 +1,31 @@
-"""Supabase Storage helper for audio uploads."""
+"""Audio file storage (Supabase Storage or local filesystem, see storage_backends)."""
 
-import os
-import logging
 import asyncio
+import time
 from app.core.logging import get_logger
-from typing import Optional
-from app.core.supabase_client import supabase
+from typing import Iterable, List, Optional
 from app.core.config import settings
+from app.core.metrics import STORAGE_SECONDS, histogram_snapshot
+from app.core.stats import register_stats
+from app.core.storage_backends import StorageBackend, get_storage_backend
+from app.audio.formats import extension_for
+
+logger = get_logger(__name__)
+
 
 class StorageManager:
-    """Manage audio file uploads to Supabase Storage."""
-    
-    def __init__(self):
-        self.bucket_name = settings.SUPABASE_BUCKET_NAME
-    
+    """Manage audio file uploads to the configured storage backend."""
+
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self._backend = backend
+
+    @property
+    def backend(self) -> StorageBackend:
+        # Resolved lazily so importing this module never needs storage credentials
+        if self._backend is None:
+            self._backend = get_storage_backend()
+        return self._backend
+
     def _get_object_key(
         self,
         user_id: str,
@@ -24,11 +36,11 @@ class StorageManager:
     ) -> str:
         """
         Generate standardized object key for audio files.
-        
+
         Pattern: {user_id}/{conversation_id}/{turn_number}/{type}.webm
         """
         return f"{user_id}/{conversation_id}/{turn_number}/{file_type}.{extension}"
-    
+
     async def upload_audio(
         self,
         audio_data: bytes,
@@ -40,51 +52,77 @@ class StorageManager:
         extension: str | None = None,
         ) -> Optional[str]:
         """
-        Upload audio to Supabase Storage and return public URL.
-        
+        Upload audio to storage and return its public URL.
+
         Returns:
             Public URL of the uploaded file, or None if upload fails
         """
-        ext = extension or (
-            "wav" if content_type == "audio/wav" else
-            "mp3" if content_type == "audio/mpeg" else
-            "webm"
-        )
+        ext = extension or extension_for(content_type, default="webm")
         object_key = self._get_object_key(user_id, conversation_id, turn_number, file_type, ext)
         attempts = 3
         for i in range(attempts):
+            started = time.perf_counter()
             try:
-                response = supabase.storage.from_(self.bucket_name).upload(
-                    path=object_key,
-                    file=audio_data,
-                    file_options={"content_type": content_type, "x-upsert": "true"}
-                )
-                public_url = supabase.storage.from_(self.bucket_name).get_public_url(object_key)
+                public_url = await self.backend.put(object_key, audio_data, content_type)
+                STORAGE_SECONDS.labels("upload", self.backend.name, "ok").observe(time.perf_counter() - started)
                 return public_url
             except Exception as e:
+                STORAGE_SECONDS.labels("upload", self.backend.name, "error").observe(time.perf_counter() - started)
                 logger.warning("Upload attempt %s failed for %s: %s", i + 1, object_key, e)
                 if i < attempts - 1:
                     await asyncio.sleep(0.8 * (i + 1))
                 else:
-                    logger.exception("Error uploading audio to Supabase Storage: %s", e)
+                    logger.exception("Error uploading audio to %s storage: %s", self.backend.name, e)
                     return None
-    
+
+    async def upload_many(self, uploads: Iterable[dict], concurrency: Optional[int] = None) -> List[Optional[str]]:
+        """
+        Run several `upload_audio` calls (given as keyword dicts) concurrently,
+        at most `concurrency` at a time. URLs are returned in input order.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.STORAGE_UPLOAD_CONCURRENCY)
+
+        async def _one(kwargs: dict) -> Optional[str]:
+            async with semaphore:
+                return await self.upload_audio(**kwargs)
+
+        return list(await asyncio.gather(*(_one(u) for u in uploads)))
+
     async def delete_audio(
         self,
         user_id: str,
         conversation_id: str,
         turn_number: int,
-        file_type: str
+        file_type: str,
+        extension: str = "webm",
     ) -> bool:
         """Delete audio file from storage."""
+        started = time.perf_counter()
         try:
-            object_key = self._get_object_key(user_id, conversation_id, turn_number, file_type)
-            supabase.storage.from_(self.bucket_name).remove([object_key])
+            object_key = self._get_object_key(user_id, conversation_id, turn_number, file_type, extension)
+            await self.backend.delete([object_key])
+            STORAGE_SECONDS.labels("delete", self.backend.name, "ok").observe(time.perf_counter() - started)
             return True
         except Exception as e:
+            STORAGE_SECONDS.labels("delete", self.backend.name, "error").observe(time.perf_counter() - started)
             logger.exception("Error deleting audio: %s", e)
             return False
 
+    def stats(self) -> dict:
+        """/statz view of the talknative_storage_seconds histogram (the one source of storage timings)."""
+        backend = self.backend.name
+        return {
+            "backend": backend,
+            "failures": {
+                op: histogram_snapshot(STORAGE_SECONDS, operation=op, backend=backend, outcome="error")["count"]
+                for op in ("upload", "delete")
+            },
+            "latency_seconds": {
+                op: histogram_snapshot(STORAGE_SECONDS, operation=op, backend=backend, outcome="ok")
+                for op in ("upload", "delete")
+            },
+        }
+
 # Singleton instance
 storage_manager = StorageManager()
-logger = get_logger(__name__)
+register_stats("storage", storage_manager.stats)
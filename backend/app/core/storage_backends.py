@@ -0,0 +1,116 @@
+"""Object storage backends for audio files: Supabase Storage (async REST) and the local filesystem."""
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+from urllib.parse import quote, urlparse
+from app.core.config import settings
+from app.core.http_clients import client_pool
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class StorageBackend(ABC):
+    """Minimal async object store: put bytes under a key, delete keys, build public URLs."""
+
+    name = "base"
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes, content_type: str) -> str:
+        """Store `data` under `key` (overwriting) and return its public URL."""
+
+    @abstractmethod
+    async def delete(self, keys: List[str]) -> None:
+        """Delete the objects under `keys`; missing keys are not an error."""
+
+    @abstractmethod
+    def public_url(self, key: str) -> str:
+        """Public URL of the object under `key`."""
+
+
+class SupabaseStorageBackend(StorageBackend):
+    """
+    Supabase Storage over its REST API, using the pooled async HTTP client,
+    so uploads never block the event loop.
+    """
+
+    name = "supabase"
+
+    def __init__(self, url: str, service_key: str, bucket: str):
+        self.url = url.rstrip("/")
+        self.host = urlparse(self.url).netloc
+        self.bucket = bucket
+        self._headers = {"Authorization": f"Bearer {service_key}", "apikey": service_key}
+
+    def _object_url(self, key: str) -> str:
+        return f"{self.url}/storage/v1/object/{self.bucket}/{quote(key)}"
+
+    async def put(self, key: str, data: bytes, content_type: str) -> str:
+        response = await client_pool.http(self.host).post(
+            self._object_url(key),
+            content=data,
+            headers={**self._headers, "Content-Type": content_type, "x-upsert": "true"},
+        )
+        response.raise_for_status()
+        return self.public_url(key)
+
+    async def delete(self, keys: List[str]) -> None:
+        response = await client_pool.http(self.host).request(
+            "DELETE",
+            f"{self.url}/storage/v1/object/{self.bucket}",
+            json={"prefixes": keys},
+            headers=self._headers,
+        )
+        response.raise_for_status()
+
+    def public_url(self, key: str) -> str:
+        return f"{self.url}/storage/v1/object/public/{self.bucket}/{quote(key)}"
+
+
+class LocalStorageBackend(StorageBackend):
+    """Files under a local directory, served by the app at `base_url` (dev/tests)."""
+
+    name = "local"
+
+    def __init__(self, root: Path, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _remove(self, keys: List[str]) -> None:
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    async def put(self, key: str, data: bytes, content_type: str) -> str:
+        await asyncio.to_thread(self._write, key, data)
+        return self.public_url(key)
+
+    async def delete(self, keys: List[str]) -> None:
+        await asyncio.to_thread(self._remove, keys)
+
+    def public_url(self, key: str) -> str:
+        return f"{self.base_url}/{quote(key)}"
+
+
+@lru_cache()
+def get_storage_backend() -> StorageBackend:
+    """Storage backend selected by STORAGE_BACKEND."""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(Path(settings.LOCAL_STORAGE_DIR), settings.LOCAL_STORAGE_BASE_URL)
+    return SupabaseStorageBackend(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY, settings.SUPABASE_BUCKET_NAME)
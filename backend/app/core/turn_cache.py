@@ -0,0 +1,104 @@
+"""In-process cache of recent turns per conversation, updated synchronously by the turn pipeline."""
+
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Iterable, List, Optional, Tuple
+from app.core.config import settings
+from app.core.stats import register_stats
+
+
+class _ConversationEntry:
+    __slots__ = ("turns", "last_turn_number", "touched_at")
+
+    def __init__(self, window: int, turns: Iterable[Tuple[str, str]], last_turn_number: int):
+        self.turns: Deque[Tuple[str, str]] = deque(turns, maxlen=window)
+        self.last_turn_number = last_turn_number
+        self.touched_at = time.monotonic()
+
+
+class ConversationTurnCache:
+    """
+    Ring buffer of the last `window` (user, assistant) exchanges per
+    conversation, with LRU eviction across conversations.
+
+    Turn numbers are allocated in the database; each entry remembers the
+    last one it has seen, and an entry that skips a number (a turn taken
+    through another process) is dropped and reloaded rather than serving
+    incomplete history. All methods are synchronous and must be called from
+    the event loop. Entries idle for longer than `ttl_seconds` are dropped
+    and reloaded from the database.
+    """
+
+    def __init__(self, max_conversations: int, window: int, ttl_seconds: float):
+        self.max_conversations = max_conversations
+        self.window = window
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _ConversationEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, conversation_id: str) -> Optional[_ConversationEntry]:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.touched_at > self.ttl_seconds:
+            del self._entries[conversation_id]
+            return None
+        entry.touched_at = time.monotonic()
+        self._entries.move_to_end(conversation_id)
+        return entry
+
+    def message_history(self, conversation_id: str) -> Optional[List[str]]:
+        """Chronological "User:/Assistant:" history, or None on a cache miss."""
+        entry = self._get(conversation_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        history = []
+        for user_text, ai_text in entry.turns:
+            history.append(f"User: {user_text}")
+            history.append(f"Assistant: {ai_text}")
+        return history
+
+    def load(self, conversation_id: str, turns: Iterable[Tuple[str, str]], last_turn_number: int) -> None:
+        """Seed an entry from the database; an entry created meanwhile wins."""
+        if self._get(conversation_id) is not None:
+            return
+        self._entries[conversation_id] = _ConversationEntry(self.window, turns, last_turn_number)
+        while len(self._entries) > self.max_conversations:
+            self._entries.popitem(last=False)
+
+    def last_turn_number(self, conversation_id: str) -> Optional[int]:
+        entry = self._entries.get(conversation_id)
+        return entry.last_turn_number if entry else None
+
+    def record_turn(self, conversation_id: str, turn_number: int, user_text: str, ai_text: str) -> None:
+        """
+        Append a completed exchange under its (database-allocated) turn number.
+
+        Nothing is cached when the entry is gone (the next turn reloads it),
+        and the entry is dropped when the number isn't the next one it expects.
+        """
+        entry = self._get(conversation_id)
+        if entry is None:
+            return
+        if turn_number != entry.last_turn_number + 1:
+            self.invalidate(conversation_id)
+            return
+        entry.last_turn_number = turn_number
+        entry.turns.append((user_text, ai_text))
+
+    def invalidate(self, conversation_id: str) -> None:
+        self._entries.pop(conversation_id, None)
+
+    def stats(self) -> dict:
+        return {"conversations": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+turn_cache = ConversationTurnCache(
+    max_conversations=settings.TURN_CACHE_MAX_CONVERSATIONS,
+    window=settings.TURN_CACHE_WINDOW,
+    ttl_seconds=settings.TURN_CACHE_TTL_SECONDS,
+)
+register_stats("turn_cache", turn_cache.stats)
@@ -0,0 +1,157 @@
+"""
+Versioned, read-only snapshot of the static content (scenarios and proverbs).
+
+Each snapshot holds the id/language/category indexes and the scenario
+catalogue pre-rendered as JSON bytes (with an ETag) per language and
+category. The store polls the source files' mtimes and, when they change,
+builds a new snapshot and swaps it in with a single assignment; requests
+holding the previous snapshot finish with it.
+"""
+
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from pydantic import TypeAdapter
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.core.logging import get_logger
+from app.core.stats import register_stats
+from app.data.proverb_loader import PROVERBS_FILE, ProverbLoader, read_proverbs
+from app.data.scenario_loader import SCENARIOS_FILE, ScenarioLoader, read_scenarios
+from app.models.schemas import ScenarioResponse
+
+logger = get_logger(__name__)
+
+_catalogue_adapter = TypeAdapter(List[ScenarioResponse])
+
+
+class RenderedCatalogue:
+    __slots__ = ("items", "body", "etag")
+
+    def __init__(self, items: List[ScenarioResponse], body: bytes, etag: str):
+        self.items = items
+        self.body = body
+        self.etag = etag
+
+
+class ContentSnapshot:
+    """One immutable version of the content; never mutated after construction."""
+
+    def __init__(self, scenarios: List[dict], proverbs: List[dict], version: str):
+        self.version = version
+        self.loaded_at = time.time()
+        self.scenarios = ScenarioLoader(scenarios)
+        self.proverbs = ProverbLoader(proverbs)
+        # (language, category or None) -> catalogue JSON, validated once here
+        self._catalogues: Dict[Tuple[str, Optional[str]], RenderedCatalogue] = {}
+        for language in {s['language'] for s in scenarios}:
+            self._render(language, None, self.scenarios.get_scenarios_by_language(language))
+            for category in self.scenarios.categories(language):
+                self._render(language, category, self.scenarios.get_scenarios_by_category(language, category))
+
+    def _render(self, language: str, category: Optional[str], scenarios: List[dict]) -> None:
+        items = _catalogue_adapter.validate_python(scenarios)
+        self._catalogues[(language, category)] = RenderedCatalogue(
+            items, _catalogue_adapter.dump_json(items), make_etag(self.version, language, category)
+        )
+
+    def catalogue(self, language: str, category: Optional[str] = None) -> RenderedCatalogue:
+        """Pre-rendered scenario list; an empty one for unknown languages/categories."""
+        language = getattr(language, "value", language)
+        rendered = self._catalogues.get((language, category))
+        if rendered is None:
+            rendered = RenderedCatalogue([], b"[]", make_etag(self.version, language, category))
+        return rendered
+
+
+class ContentStore:
+    """Holds the current ContentSnapshot and hot-reloads it when the files change."""
+
+    def __init__(self, scenarios_file: Path, proverbs_file: Path):
+        self.files = (scenarios_file, proverbs_file)
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._mtimes: Tuple[float, ...] = ()
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.reload_failures = 0
+
+    @property
+    def snapshot(self) -> ContentSnapshot:
+        # Built lazily so scripts get content without starting the watcher
+        if self._snapshot is None:
+            self.reload()
+        return self._snapshot
+
+    @property
+    def version(self) -> str:
+        return self.snapshot.version
+
+    def _current_mtimes(self) -> Tuple[float, ...]:
+        return tuple(f.stat().st_mtime if f.exists() else 0.0 for f in self.files)
+
+    def reload(self) -> ContentSnapshot:
+        """Read both files, build a new snapshot and swap it in."""
+        scenarios_file, proverbs_file = self.files
+        mtimes = self._current_mtimes()
+        raw = b"".join(f.read_bytes() if f.exists() else b"" for f in self.files)
+        snapshot = ContentSnapshot(
+            read_scenarios(scenarios_file),
+            read_proverbs(proverbs_file),
+            hashlib.sha1(raw).hexdigest()[:12],
+        )
+        self._snapshot = snapshot
+        self._mtimes = mtimes
+        self.reloads += 1
+        logger.info("Content version %s loaded", snapshot.version)
+        return snapshot
+
+    def reload_if_changed(self) -> bool:
+        """Reload when a file's mtime moved; a broken file keeps the current snapshot."""
+        if self._snapshot is not None and self._current_mtimes() == self._mtimes:
+            return False
+        try:
+            self.reload()
+            return True
+        except Exception as e:
+            self.reload_failures += 1
+            # Don't retry the same broken file on every poll
+            self._mtimes = self._current_mtimes()
+            logger.error("Content reload failed, keeping version %s: %s",
+                         self._snapshot.version if self._snapshot else None, e)
+            return False
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            # Parsing and rendering is CPU work; keep it off the event loop
+            await asyncio.to_thread(self.reload_if_changed)
+
+    def start_watching(self, interval: float = None) -> None:
+        interval = settings.CONTENT_RELOAD_INTERVAL_SECONDS if interval is None else interval
+        self.snapshot  # fail fast on broken content at startup
+        if interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "reloads": self.reloads,
+            "reload_failures": self.reload_failures,
+        }
+
+
+content_store = ContentStore(SCENARIOS_FILE, PROVERBS_FILE)
+register_stats("content", content_store.stats)
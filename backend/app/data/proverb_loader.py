@@ -1,37 +1,105 @@
 import json
+import random
 from pathlib import Path
-from typing import List, Optional, Dict
-from functools import lru_cache
+from typing import Collection, List, Optional, Dict, Sequence
 from app.core.logging import get_logger
 
 PROVERBS_FILE = Path(__file__).parent / "proverbs.json"
 
-class ProverbLoader:
-    def __init__(self):
-        self._proverbs: Dict[str, dict] = {}
-        self._load_proverbs()
+# Relative drop weights; proverbs with an unknown rarity count as common
+RARITY_WEIGHTS = {"common": 60.0, "uncommon": 25.0, "rare": 12.0, "legendary": 3.0}
+
+# Rejection draws before falling back to a scan of the unowned proverbs
+MAX_REJECTIONS = 32
+
+class AliasTable:
+    """Vose's alias method: O(n) setup, O(1) weighted draws."""
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng: random.Random) -> int:
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+def read_proverbs(path: Path = PROVERBS_FILE) -> List[dict]:
+    if not path.exists():
+        logger.warning("%s not found", path)
+        return []
     
-    def _load_proverbs(self):
-        if not PROVERBS_FILE.exists():
-            logger.warning("%s not found", PROVERBS_FILE)
-            return
-        
-        with open(PROVERBS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Index by ID
-            self._proverbs = {p['id']: p for p in data}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class ProverbLoader:
+    """Proverbs indexed by id and language, with per-language loot samplers (read-only)."""
+    def __init__(self, proverbs: Optional[List[dict]] = None):
+        if proverbs is None:
+            proverbs = read_proverbs()
+        # Index by ID
+        self._proverbs: Dict[str, dict] = {p['id']: p for p in proverbs}
+        self._by_language: Dict[str, List[dict]] = {}
+
+        # Per-language lists and their rarity-weighted samplers
+        for p in self._proverbs.values():
+            self._by_language.setdefault(p['language'], []).append(p)
+        self._alias: Dict[str, AliasTable] = {
+            language: AliasTable([self.weight(p) for p in proverbs])
+            for language, proverbs in self._by_language.items()
+        }
+
+    @staticmethod
+    def weight(proverb: dict) -> float:
+        return RARITY_WEIGHTS.get(proverb.get('rarity'), RARITY_WEIGHTS['common'])
 
     def get_proverb(self, proverb_id: str) -> Optional[dict]:
         return self._proverbs.get(proverb_id)
 
     def get_proverbs_by_language(self, language: str) -> List[dict]:
-        return [p for p in self._proverbs.values() if p['language'] == language]
+        return self._by_language.get(getattr(language, "value", language), [])
 
     def get_all_proverbs(self) -> List[dict]:
         return list(self._proverbs.values())
 
-@lru_cache()
+    def sample_unowned(self, language: str, owned: Collection[str], rng: random.Random = random) -> Optional[dict]:
+        """
+        Rarity-weighted random proverb in `language` whose id is not in `owned`,
+        or None when the user owns them all.
+
+        Draws from the language's alias table and rejects owned proverbs; once
+        most of the deck is owned, it samples the remainder directly instead.
+        """
+        language = getattr(language, "value", language)
+        proverbs = self._by_language.get(language)
+        if not proverbs:
+            return None
+        table = self._alias[language]
+        for _ in range(MAX_REJECTIONS):
+            candidate = proverbs[table.sample(rng)]
+            if candidate['id'] not in owned:
+                return candidate
+        remaining = [p for p in proverbs if p['id'] not in owned]
+        if not remaining:
+            return None
+        return rng.choices(remaining, weights=[self.weight(p) for p in remaining])[0]
+
 def get_proverb_loader() -> ProverbLoader:
-    return ProverbLoader()
+    """Proverb index of the current content snapshot (swapped on hot reload)."""
+    # Imported here: the content store builds ProverbLoader instances itself
+    from app.data.content_store import content_store
+    return content_store.snapshot.proverbs
 
 logger = get_logger(__name__)
@@ -1,27 +1,31 @@
 import json
 from pathlib import Path
 from typing import Dict, List, Optional
-from functools import lru_cache
 
 SCENARIOS_FILE = Path(__file__).parent / "scenarios.json"
 
-class ScenarioLoader:
-    """Load and manage scenarios from JSON file."""
+def read_scenarios(path: Path = SCENARIOS_FILE) -> List[dict]:
+    """Read the scenario list from JSON file."""
+    if not path.exists():
+        raise FileNotFoundError(f"Scenarios file not found: {path}")
     
-    def __init__(self):
-        self._scenarios: Dict[str, dict] = {}
-        self._load_scenarios()
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class ScenarioLoader:
+    """Scenarios indexed by id, language and category (read-only; see content_store)."""
     
-    def _load_scenarios(self):
-        """Load scenarios from JSON file."""
-        if not SCENARIOS_FILE.exists():
-            raise FileNotFoundError(f"Scenarios file not found: {SCENARIOS_FILE}")
-        
-        with open(SCENARIOS_FILE, 'r', encoding='utf-8') as f:
-            scenarios_list = json.load(f)
+    def __init__(self, scenarios_list: Optional[List[dict]] = None):
+        if scenarios_list is None:
+            scenarios_list = read_scenarios()
         
         # Index by ID for quick lookup
-        self._scenarios = {s['id']: s for s in scenarios_list}
+        self._scenarios: Dict[str, dict] = {s['id']: s for s in scenarios_list}
+        self._by_language: Dict[str, List[dict]] = {}
+        self._by_category: Dict[tuple, List[dict]] = {}
+        for s in self._scenarios.values():
+            self._by_language.setdefault(s['language'], []).append(s)
+            self._by_category.setdefault((s['language'], s.get('category')), []).append(s)
     
     def get_scenario(self, scenario_id: str) -> Optional[dict]:
         """Get a scenario by ID."""
@@ -29,7 +33,15 @@ class ScenarioLoader:
     
     def get_scenarios_by_language(self, language: str) -> List[dict]:
         """Get all scenarios for a given language."""
-        return [s for s in self._scenarios.values() if s['language'] == language]
+        return self._by_language.get(getattr(language, "value", language), [])
+    
+    def get_scenarios_by_category(self, language: str, category: str) -> List[dict]:
+        """Get the scenarios of one category in a given language."""
+        return self._by_category.get((getattr(language, "value", language), category), [])
+    
+    def categories(self, language: str) -> List[str]:
+        """Categories with at least one scenario in `language`, in file order."""
+        return [c for (lang, c) in self._by_category if lang == language and c]
     
     def get_all_scenarios(self) -> List[dict]:
         """Get all scenarios."""
@@ -39,7 +51,8 @@ class ScenarioLoader:
         """Check if a scenario exists."""
         return scenario_id in self._scenarios
 
-@lru_cache()
 def get_scenario_loader() -> ScenarioLoader:
-    """Get cached scenario loader instance."""
-    return ScenarioLoader()
+    """Scenario index of the current content snapshot (swapped on hot reload)."""
+    # Imported here: the content store builds ScenarioLoader instances itself
+    from app.data.content_store import content_store
+    return content_store.snapshot.scenarios
@@ -1,14 +1,75 @@
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CONNECTIONS, DB_POOL_TIMEOUTS, register_gauge_refresher
+from app.core.stats import Histogram, register_stats
 
 # Ensure DATABASE_URL uses the correct driver for psycopg3
 database_url = settings.DATABASE_URL
 if database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+psycopg://", 1)
 
+# Sync engine: scripts and migrations
 engine = create_engine(database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits (including connects for overflow)."""
+
+    checkout_wait = Histogram((0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+    timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            TimedAsyncQueuePool.timeouts += 1
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+
+# Async engine: the API (psycopg async driver)
+async_engine = create_async_engine(
+    database_url,
+    poolclass=TimedAsyncQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
+
+
+def pool_stats() -> dict:
+    pool = async_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checked_in": pool.checkedin(),
+        "timeouts": TimedAsyncQueuePool.timeouts,
+        "checkout_wait_seconds": TimedAsyncQueuePool.checkout_wait.snapshot(),
+    }
+
+
+def refresh_pool_gauges() -> None:
+    pool = async_engine.pool
+    DB_POOL_CONNECTIONS.labels("checked_out").set(pool.checkedout())
+    DB_POOL_CONNECTIONS.labels("checked_in").set(pool.checkedin())
+    DB_POOL_CONNECTIONS.labels("overflow").set(max(0, pool.overflow()))
+
+
+register_stats("db_pool", pool_stats)
+register_gauge_refresher(refresh_pool_gauges)
@@ -1,8 +1,5 @@
-from app.db.base import SessionLocal
+from app.db.base import AsyncSessionLocal
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
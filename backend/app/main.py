@@ -1,16 +1,48 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from app.core.auth import require_ops_token
 from app.core.config import settings
-from app.core.logging import configure_logging
+from app.core.logging import configure_logging, get_logger
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import ProfilingMiddleware
+from app.core.stats import collect_stats
+from app.core.http_clients import client_pool
+from app.db.base import async_engine
+from app.ai.agent import agent_registry
+from app.data.content_store import content_store
+from app.workers.outbox_worker import outbox_worker
 from app.api.v1.chat import router as chat_router
 from app.api.v1.users import router as users_router
 from app.api.v1.scenarios import router as scenarios_router
 from app.api.v1.conversations import router as conversations_router
 from app.api.v1.vocabulary import router as vocabulary_router
 from app.api.v1.game import router as game_router
+from app.api.v1.bootstrap import router as bootstrap_router
 
 configure_logging(settings.LOG_LEVEL)
-app = FastAPI(title="TalkNative API", version="2.0")
+logger = get_logger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await client_pool.startup()
+    content_store.start_watching()
+    if settings.AI_AGENT_PREWARM:
+        logger.info("Prebuilt %s AI agents", agent_registry.warm())
+    if settings.OUTBOX_WORKER_IN_PROCESS:
+        outbox_worker.start()
+    yield
+    if settings.OUTBOX_WORKER_IN_PROCESS:
+        # Drain queued turns while the storage client is still open
+        await outbox_worker.stop()
+    # Agents hold the pooled GenAI client, so drop them before closing it
+    agent_registry.clear()
+    await client_pool.shutdown()
+    await content_store.stop_watching()
+    await async_engine.dispose()
+
+app = FastAPI(title="TalkNative API", version="2.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,12 +50,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Has-More", "ETag", "Server-Timing", "X-Profile-Id"],
 )
+app.add_middleware(MetricsMiddleware)
+# Outermost, so a profile covers routing, auth and every router; not installed at all when disabled
+if settings.PROFILER_TOKEN or settings.PROFILER_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilingMiddleware)
 
 @app.get("/healthz")
 def healthz():
     return {"ok": True}
 
+# Internal state: bearer OPS_TOKEN only
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_ops_token)])
+async def metrics():
+    body, content_type = await render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/statz", include_in_schema=False, dependencies=[Depends(require_ops_token)])
+async def statz():
+    return await collect_stats()
+
+# Local storage backend (dev): serve uploaded audio from the app itself
+if settings.STORAGE_BACKEND == "local" and settings.LOCAL_STORAGE_BASE_URL.startswith("/"):
+    app.mount(
+        settings.LOCAL_STORAGE_BASE_URL,
+        StaticFiles(directory=settings.LOCAL_STORAGE_DIR, check_dir=False),
+        name="media",
+    )
+
 # V1 API routes
 app.include_router(chat_router, prefix="/api/v1", tags=["chat-legacy"])
 app.include_router(users_router, prefix="/api/v1/user")
@@ -31,3 +86,4 @@ app.include_router(scenarios_router, prefix="/api/v1/scenarios")
 app.include_router(conversations_router, prefix="/api/v1/chat")
 app.include_router(vocabulary_router, prefix="/api/v1/vocabulary")
 app.include_router(game_router, prefix="/api/v1/game")
+app.include_router(bootstrap_router, prefix="/api/v1/bootstrap")
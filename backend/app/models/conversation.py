@@ -1,15 +1,26 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, func
+from sqlalchemy import Column, String, Integer, Text, DateTime, Boolean, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Keyset pagination of a user's history, newest first
+        Index("ix_conversations_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True)  # UUID
     user_id = Column(String, ForeignKey("profiles.id"), nullable=False, index=True)
     scenario_id = Column(String, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     active = Column(Boolean, default=True, nullable=False)
+
+    # Denormalized from turns; maintained by the outbox worker when turns are saved
+    turn_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_message = Column(Text, nullable=True)  # preview of the latest AI reply
+    last_turn_at = Column(DateTime(timezone=True), nullable=True)
+    # Last turn number handed out; incremented by the turn endpoints (UPDATE ... RETURNING)
+    last_turn_number = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     turns = relationship("Turn", back_populates="conversation", cascade="all, delete-orphan")
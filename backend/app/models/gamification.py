@@ -19,4 +19,7 @@ class UserProverb(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("profiles.id"), nullable=False)
     proverb_id = Column(String, nullable=False) # We link to JSON ID, not a DB FK for now
-    acquired_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    acquired_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # A proverb drops at most once per user; also serves the owned-ids lookup
+    __table_args__ = (UniqueConstraint('user_id', 'proverb_id', name='uq_user_proverb'),)
\ No newline at end of file
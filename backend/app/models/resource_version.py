@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, func
+from app.db.base import Base
+
+class UserResourceVersion(Base):
+    """Per-user change counter for a cacheable resource (see app/core/resource_versions.py)."""
+    __tablename__ = "user_resource_versions"
+
+    user_id = Column(String, ForeignKey("profiles.id", ondelete="CASCADE"), primary_key=True)
+    resource = Column(String, primary_key=True)  # "progress", "deck", "vocabulary"
+    version = Column(BigInteger, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum, func
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum, func
 from app.db.base import Base
 from app.models.user import LanguageEnum
 
 
 class SavedWord(Base):
     __tablename__ = "saved_words"
+    __table_args__ = (
+        # One entry per word per user; bulk saves rely on it for ON CONFLICT
+        Index("uq_saved_words_user_word", "user_id", "word", unique=True),
+        # Review queue: a user's due words in due order
+        Index("ix_saved_words_user_due", "user_id", "due_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(String, ForeignKey("profiles.id"), nullable=False, index=True)
@@ -13,3 +19,10 @@ class SavedWord(Base):
     context_sentence = Column(Text, nullable=True)
     language = Column(SQLEnum(LanguageEnum), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Spaced repetition (SM-2) state, see app/core/srs.py; new words are due immediately
+    due_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    interval_days = Column(Integer, nullable=False, default=0, server_default="0")
+    ease = Column(Float, nullable=False, default=2.5, server_default="2.5")
+    repetitions = Column(Integer, nullable=False, default=0, server_default="0")
+    last_reviewed_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, Literal
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional, Literal
 from datetime import datetime
 
 # Enums
@@ -45,6 +45,7 @@ class ScenarioResponse(BaseModel):
     language: LanguageType
     category: Optional[str] = None
     title: str
+    level: Optional[int] = None  # position on the map
     difficulty: DifficultyType
     description: Optional[str] = None
     roles: Optional[ScenarioRoles] = None
@@ -87,6 +88,7 @@ class ConversationHistoryResponse(BaseModel):
     created_at: datetime
     turn_count: int
     last_message: Optional[str]
+    last_turn_at: Optional[datetime] = None
     active: bool
 
 # Vocabulary schemas
@@ -95,6 +97,9 @@ class SaveWordRequest(BaseModel):
     translation: str
     context_sentence: Optional[str] = None
 
+class SaveWordsRequest(BaseModel):
+    words: List[SaveWordRequest] = Field(..., min_length=1, max_length=500)
+
 class SavedWordResponse(BaseModel):
     id: int
     word: str
@@ -102,6 +107,44 @@ class SavedWordResponse(BaseModel):
     context_sentence: Optional[str]
     language: LanguageType
     created_at: datetime
+    due_at: Optional[datetime] = None
+    interval_days: int = 0
+    ease: float = 2.5
+    repetitions: int = 0
+    last_reviewed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+class FinishScenarioRequest(BaseModel):
+    scenario_id: str = Field(..., min_length=1)
+    stars: int = Field(0, ge=0, le=3)
+
+class ReviewWordRequest(BaseModel):
+    word_id: int
+    grade: int = Field(..., ge=0, le=5)  # SM-2: 0 = forgot, 3 = recalled with effort, 5 = perfect
+
+class SaveWordResult(BaseModel):
+    word: str
+    status: Literal["created", "duplicate"]
+    id: Optional[int] = None  # set for created words
+
+class SaveWordsResponse(BaseModel):
+    created: int
+    duplicates: int
+    results: List[SaveWordResult]
+
+# Dashboard bootstrap schemas
+class MapNode(BaseModel):
+    scenario_id: str
+    level: Optional[int] = None
+    stars: int
+    unlocked: bool
+
+class BootstrapResponse(BaseModel):
+    profile: UserProfileResponse
+    scenarios: List[ScenarioResponse]
+    map: List[MapNode]
+    deck: List[dict]
+    history: List[ConversationHistoryResponse]
+    history_next_cursor: Optional[str] = None
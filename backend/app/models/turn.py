@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Float, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Turn(Base):
     __tablename__ = "turns"
+    __table_args__ = (
+        # Transcript pages and the latest-turn lookup walk turns by number;
+        # unique so a reused turn number fails instead of being saved twice
+        Index("uq_turns_conversation_turn_number", "conversation_id", "turn_number", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     conversation_id = Column(String, ForeignKey("conversations.id"), nullable=False, index=True)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, LargeBinary, ForeignKey, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base import Base
+
+class TurnOutbox(Base):
+    """A completed turn waiting to be uploaded and saved by the outbox worker."""
+    __tablename__ = "turn_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    conversation_id = Column(String, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String, nullable=False)
+    turn_number = Column(Integer, nullable=False)
+
+    # Turn fields (ConversationTurn output), applied to a Turn row on insert
+    payload = Column(JSONB, nullable=False)
+    user_audio = Column(LargeBinary, nullable=True)
+    user_audio_content_type = Column(String, nullable=True)
+    ai_audio = Column(LargeBinary, nullable=True)
+    ai_audio_content_type = Column(String, nullable=True)  # NULL: not yet encoded for delivery
+
+    # Delivery state
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    failed_at = Column(DateTime(timezone=True), nullable=True)  # gave up after OUTBOX_MAX_ATTEMPTS
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_turn_outbox_next_attempt_at', 'next_attempt_at', postgresql_where=text('failed_at IS NULL')),
+    )
@@ -1,22 +1,116 @@
+import time
+from typing import AsyncIterator, List, Optional
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import FALLBACKS, TTS_SECONDS, add_timing
+from app.audio.formats import concat_audio, is_wav, pcm_to_wav, wav_to_pcm
+from app.tts.pipeline import split_text, iter_segments
+from app.tts.cache import tts_cache, make_key
 
 logger = get_logger(__name__)
 
-async def synthesize_speech(text: str, language: str) -> bytes:
-    if settings.TTS_PROVIDER == "gemini":
-        from app.tts.gemini_provider import synthesize_speech as gemini_tts
-        audio = await gemini_tts(text, language)
-        if audio:
-            return audio
-        logger.warning("Gemini TTS produced empty audio; attempting YarnGPT fallback")
-        from app.tts.yarngpt_provider import synthesize_speech as yarngpt_tts
-        return await yarngpt_tts(text, language)
+PROVIDER_NAMES = {"gemini": "Gemini", "yarngpt": "YarnGPT"}
+
+def _voice_for(provider: str, language: str) -> str:
+    if provider == "gemini":
+        from app.tts.gemini_provider import VOICE_MAP
+        return VOICE_MAP.get(language, "Archernar")
+    from app.tts.yarngpt_provider import VOICE_MAP
+    return VOICE_MAP.get(language, "idera")
+
+async def _timed_provider(provider: str, text: str, language: str) -> bytes:
+    """Call one TTS provider, recording its latency and whether it produced audio."""
+    if provider == "gemini":
+        from app.tts.gemini_provider import synthesize_speech as provider_tts
     else:
-        from app.tts.yarngpt_provider import synthesize_speech as yarngpt_tts
-        audio = await yarngpt_tts(text, language)
-        if audio:
-            return audio
-        logger.warning("YarnGPT TTS produced empty audio; attempting Gemini fallback")
-        from app.tts.gemini_provider import synthesize_speech as gemini_tts
-        return await gemini_tts(text, language)
+        from app.tts.yarngpt_provider import synthesize_speech as provider_tts
+    started = time.perf_counter()
+    audio = b""
+    try:
+        audio = await provider_tts(text, language)
+        return audio
+    finally:
+        elapsed = time.perf_counter() - started
+        TTS_SECONDS.labels(provider, "ok" if audio else "empty").observe(elapsed)
+        add_timing(f"tts.{provider}", elapsed)
+
+async def _synthesize_with(provider: str, text: str, language: str) -> bytes:
+    """Synthesize with one provider, cached under that provider's own key and voice."""
+    if not settings.TTS_CACHE_ENABLED:
+        return await _timed_provider(provider, text, language)
+    key = make_key(text, language, _voice_for(provider, language), provider)
+    return await tts_cache.get_or_create(key, lambda: _timed_provider(provider, text, language))
+
+async def _synthesize_segment(text: str, language: str) -> bytes:
+    """
+    Synthesize one segment with the configured provider, falling back to the
+    other. Each provider's audio is cached separately, so fallback output is
+    never served as the primary voice once it recovers.
+    """
+    primary = settings.TTS_PROVIDER
+    fallback = "yarngpt" if primary == "gemini" else "gemini"
+    audio = await _synthesize_with(primary, text, language)
+    if audio:
+        return audio
+    logger.warning("%s TTS produced empty audio; attempting %s fallback", PROVIDER_NAMES[primary], PROVIDER_NAMES[fallback])
+    FALLBACKS.labels("tts_provider").inc()
+    return await _synthesize_with(fallback, text, language)
+
+async def stream_speech(text: str, language: str) -> AsyncIterator[bytes]:
+    """
+    Yield the reply audio segment by segment, in order.
+
+    Each non-empty chunk is a standalone playable clip. A segment whose
+    synthesis failed on every provider is yielded as b"", so callers can
+    skip it for playback but know the audio is incomplete.
+    """
+    segments = split_text(text) if settings.TTS_PIPELINE_ENABLED else [text]
+    index = 0
+    async for audio in iter_segments(segments, language, _synthesize_segment):
+        if not audio:
+            logger.warning("TTS segment %s produced empty audio", index)
+        yield audio
+        index += 1
+
+async def _normalize_segments(segments: List[bytes]) -> Optional[bytes]:
+    """Decode mixed-format segments to one mono PCM format with ffmpeg and merge them into a WAV."""
+    from app.audio.preprocess import decode_to_pcm
+    from app.audio.transcode import ffmpeg_path
+
+    if ffmpeg_path() is None:
+        return None
+    try:
+        # Keep the first WAV segment's rate (the primary provider's, normally)
+        rate = next((wav_to_pcm(s)[1][0] for s in segments if is_wav(s)), 24000)
+        pcm = [await decode_to_pcm(s, rate) for s in segments if s]
+    except Exception as e:
+        logger.warning("Could not normalize TTS segments: %s", e)
+        return None
+    return pcm_to_wav(b"".join(p.tobytes() for p in pcm), sample_rate=rate)
+
+async def merge_speech(segments: List[bytes], text: str, language: str) -> bytes:
+    """
+    Merge synthesized segments into one file. Segments in different formats
+    are normalized; if that fails the whole reply is synthesized in one call.
+    """
+    merged = concat_audio(segments)
+    if merged is None:
+        merged = await _normalize_segments(segments)
+    if merged is None:
+        logger.warning("TTS segments could not be merged; synthesizing whole reply")
+        FALLBACKS.labels("tts_whole_reply").inc()
+        return await _synthesize_segment(text, language)
+    return merged
+
+async def synthesize_speech(text: str, language: str) -> bytes:
+    segments = split_text(text) if settings.TTS_PIPELINE_ENABLED else [text]
+    if len(segments) <= 1:
+        return await _synthesize_segment(text, language)
+
+    audio = [a async for a in iter_segments(segments, language, _synthesize_segment)]
+    if not all(audio):
+        # Don't return a reply with a missing sentence; retry as one request
+        logger.warning("Pipelined TTS lost %s/%s segments; synthesizing whole reply", audio.count(b""), len(audio))
+        FALLBACKS.labels("tts_whole_reply").inc()
+        return await _synthesize_segment(text, language)
+    return await merge_speech(audio, text, language)
@@ -0,0 +1,216 @@
+"""Content-addressed cache for synthesized audio: memory LRU, then disk, then the provider."""
+
+import asyncio
+import hashlib
+import os
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.stats import register_stats
+
+logger = get_logger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and collapse whitespace so trivially different strings share an entry."""
+    return unicodedata.normalize("NFC", " ".join((text or "").split()))
+
+
+def make_key(text: str, language: str, voice: str, provider: str) -> str:
+    raw = "\x1f".join([normalize_text(text), language, voice, provider])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Two-tier audio cache with single-flight coalescing.
+
+    - Memory: LRU bounded by total bytes.
+    - Disk: one file per key under `disk_dir`, bounded by total bytes and
+      evicted least-recently-used first. Disabled when `disk_dir` is empty.
+    - Concurrent misses for the same key share one provider call.
+    Empty audio (a failed synthesis) is never cached.
+    """
+
+    def __init__(self, memory_bytes: int, disk_dir: str, disk_bytes: int):
+        self.memory_limit = memory_bytes
+        self.disk_limit = disk_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_size = 0
+        self._disk_index_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    # Memory tier
+
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+        return audio
+
+    def _memory_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_limit:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    # Disk tier (file IO runs in a worker thread)
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.audio"
+
+    def _scan_disk(self) -> List[Tuple[str, int]]:
+        """(key, size) of every cached file, oldest first."""
+        entries = []
+        for path in self.disk_dir.glob("*/*.audio"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path.stem, st.st_size))
+        return [(key, size) for _, key, size in sorted(entries)]
+
+    async def _load_disk_index(self) -> None:
+        # Scanned in a thread, applied on the event loop
+        try:
+            entries = await asyncio.to_thread(self._scan_disk)
+        except OSError as e:
+            logger.warning("TTS disk cache scan failed: %s", e)
+            return
+        # Files written while the scan ran are newer: keep them at the recent end
+        for key, size in reversed(entries):
+            if key not in self._disk:
+                self._disk[key] = size
+                self._disk_size += size
+                self._disk.move_to_end(key, last=False)
+
+    async def _ensure_disk_index(self) -> None:
+        """Load the disk index exactly once; concurrent callers share the same scan."""
+        if self._disk_index_task is None:
+            self._disk_index_task = asyncio.create_task(self._load_disk_index())
+        await asyncio.shield(self._disk_index_task)
+
+    def _disk_read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # Refresh recency for eviction after restarts
+            return audio
+        except OSError:
+            return None
+
+    def _disk_write(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)
+
+    def _disk_delete(self, keys: list) -> None:
+        for key in keys:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    async def _disk_get(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        await self._ensure_disk_index()
+        if key not in self._disk:
+            return None
+        audio = await asyncio.to_thread(self._disk_read, key)
+        if audio is None:
+            self._disk_size -= self._disk.pop(key, 0)
+        else:
+            self._disk.move_to_end(key)
+        return audio
+
+    async def _disk_put(self, key: str, audio: bytes) -> None:
+        if not self.disk_dir or len(audio) > self.disk_limit:
+            return
+        await self._ensure_disk_index()
+        try:
+            await asyncio.to_thread(self._disk_write, key, audio)
+        except OSError as e:
+            logger.warning("TTS disk cache write failed: %s", e)
+            return
+        self._disk_size += len(audio) - self._disk.pop(key, 0)
+        self._disk[key] = len(audio)
+        evicted = []
+        while self._disk_size > self.disk_limit and self._disk:
+            old_key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            evicted.append(old_key)
+        if evicted:
+            await asyncio.to_thread(self._disk_delete, evicted)
+
+    # Public API
+
+    async def _fill(self, key: str, producer: Callable[[], Awaitable[bytes]]) -> bytes:
+        try:
+            audio = await self._disk_get(key)
+            if audio is not None:
+                self.disk_hits += 1
+                self._memory_put(key, audio)
+                return audio
+            self.misses += 1
+            audio = await producer()
+            if audio:
+                self._memory_put(key, audio)
+                await self._disk_put(key, audio)
+            return audio
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get_or_create(self, key: str, producer: Callable[[], Awaitable[bytes]]) -> bytes:
+        audio = self._memory_get(key)
+        if audio is not None:
+            self.memory_hits += 1
+            return audio
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fill(key, producer))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        # Shielded so one cancelled caller doesn't abort the call others are waiting on
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_size,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_size,
+        }
+
+
+tts_cache = TTSCache(
+    memory_bytes=settings.TTS_CACHE_MEMORY_MB * 1024 * 1024,
+    disk_dir=settings.TTS_CACHE_DIR,
+    disk_bytes=settings.TTS_CACHE_DISK_MB * 1024 * 1024,
+)
+register_stats("tts_cache", tts_cache.stats)
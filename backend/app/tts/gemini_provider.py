@@ -1,8 +1,8 @@
 import base64
-from google import genai
 from google.genai import types
-from app.core.config import settings
+from app.core.http_clients import client_pool
 from app.core.logging import get_logger
+from app.audio.formats import is_wav, pcm_rate_from_mime, pcm_to_wav
 
 logger = get_logger(__name__)
 
@@ -17,11 +17,13 @@ VOICE_MAP = {
 async def synthesize_speech(text: str, language: str) -> bytes:
     """
     Generate speech using Google Gemini via direct API.
+    Gemini returns raw 16-bit PCM; it is wrapped in a WAV container so
+    segments can be stitched and played like YarnGPT output.
     """
     voice_name = VOICE_MAP.get(language, "Archernar")
     
     try:
-        client = genai.Client(api_key=settings.GOOGLE_API_KEY)
+        client = client_pool.genai()
         
         model_id = "gemini-2.5-flash-tts" 
 
@@ -44,8 +46,13 @@ async def synthesize_speech(text: str, language: str) -> bytes:
         # Extract audio bytes from the response parts
         for part in response.candidates[0].content.parts:
             if part.inline_data and part.inline_data.mime_type.startswith("audio"):
-                # The SDK usually returns base64 string in inline_data.data for audio
-                return base64.b64decode(part.inline_data.data)
+                # Newer SDKs return raw bytes; older ones a base64 string
+                audio = part.inline_data.data
+                if isinstance(audio, str):
+                    audio = base64.b64decode(audio)
+                if is_wav(audio):
+                    return audio
+                return pcm_to_wav(audio, sample_rate=pcm_rate_from_mime(part.inline_data.mime_type))
 
         logger.error("Gemini response contained no audio data")
         return b""
@@ -0,0 +1,77 @@
+"""Sentence-level TTS pipeline: split, synthesize concurrently, reassemble in order."""
+
+import asyncio
+import re
+from typing import AsyncIterator, Awaitable, Callable, List
+from app.core.config import settings
+
+SynthesizeFn = Callable[[str, str], Awaitable[bytes]]
+
+# Split after sentence punctuation (incl. the ellipsis character) followed by whitespace
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+")
+_CLAUSE_RE = re.compile(r"(?<=[,;:])\s+")
+
+
+def split_text(text: str, min_chars: int | None = None, max_chars: int | None = None) -> List[str]:
+    """
+    Split a reply into synthesis segments.
+
+    Sentences shorter than `min_chars` are merged with the next one so we
+    don't pay a provider round trip for "Ah!". Sentences longer than
+    `max_chars` are broken at clause punctuation.
+    """
+    min_chars = settings.TTS_SEGMENT_MIN_CHARS if min_chars is None else min_chars
+    max_chars = settings.TTS_SEGMENT_MAX_CHARS if max_chars is None else max_chars
+    text = (text or "").strip()
+    if not text:
+        return []
+
+    pieces: List[str] = []
+    for sentence in _SENTENCE_RE.split(text):
+        if len(sentence) > max_chars:
+            pieces.extend(_CLAUSE_RE.split(sentence))
+        else:
+            pieces.append(sentence)
+
+    segments: List[str] = []
+    buf = ""
+    for piece in pieces:
+        buf = f"{buf} {piece}".strip() if buf else piece.strip()
+        if len(buf) >= min_chars:
+            segments.append(buf)
+            buf = ""
+    if buf:
+        if segments and len(buf) < min_chars:
+            segments[-1] = f"{segments[-1]} {buf}"
+        else:
+            segments.append(buf)
+    return segments
+
+
+async def iter_segments(
+    segments: List[str],
+    language: str,
+    synthesize: SynthesizeFn,
+    concurrency: int | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Synthesize segments with bounded fan-out and yield the audio in order.
+
+    All segments start as soon as a slot is free; segment N is yielded as
+    soon as it (and everything before it) is ready, so consumers can start
+    playback on segment one. Unfinished work is cancelled if the consumer
+    stops early.
+    """
+    sem = asyncio.Semaphore(concurrency or settings.TTS_SEGMENT_CONCURRENCY)
+
+    async def _bounded(segment: str) -> bytes:
+        async with sem:
+            return await synthesize(segment, language)
+
+    tasks = [asyncio.create_task(_bounded(s)) for s in segments]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
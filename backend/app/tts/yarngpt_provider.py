@@ -2,6 +2,7 @@ import httpx
 import asyncio
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.http_clients import client_pool, YARNGPT_HOST
 
 VOICE_MAP = {
     "yoruba": "idera",
@@ -15,14 +16,15 @@ async def synthesize_speech(text: str, language: str) -> bytes:
     for i in range(attempts):
         try:
             timeout = httpx.Timeout(connect=5.0, read=45.0, write=10.0, pool=5.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                r = await client.post(
-                    "https://yarngpt.ai/api/v1/tts",
-                    headers={"Authorization": f"Bearer {settings.YARNGPT_API_KEY}"},
-                    json={"text": text, "voice_id": voice_id, "language": language},
-                )
-                r.raise_for_status()
-                return r.content
+            client = client_pool.http(YARNGPT_HOST)
+            r = await client.post(
+                f"https://{YARNGPT_HOST}/api/v1/tts",
+                headers={"Authorization": f"Bearer {settings.YARNGPT_API_KEY}"},
+                json={"text": text, "voice_id": voice_id, "language": language},
+                timeout=timeout,
+            )
+            r.raise_for_status()
+            return r.content
         except Exception as e:
             logger.warning("YarnGPT TTS attempt %s failed: %s", i + 1, e)
             if i < attempts - 1:
@@ -0,0 +1,353 @@
+"""
+Turn persistence outbox.
+
+The turn endpoints write each completed turn (AI output plus both audio
+buffers) to the `turn_outbox` table before responding. This worker claims
+pending rows with `SELECT ... FOR UPDATE SKIP LOCKED`, uploads the audio,
+inserts the `Turn` rows in batches and deletes the outbox rows in the same
+transaction. Failures are retried with exponential backoff.
+
+It runs inside the API process (OUTBOX_WORKER_IN_PROCESS) or standalone:
+    python -m app.workers.outbox_worker
+"""
+
+import asyncio
+import signal
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.audio.formats import sniff_content_type
+from app.audio.transcode import transcode
+from app.core.config import settings
+from app.core.logging import configure_logging, get_logger
+from app.core.metrics import OUTBOX_LAG_SECONDS, OUTBOX_ROWS, register_gauge_refresher, stage
+from app.core.stats import register_stats
+from app.core.storage import storage_manager
+from app.db.base import AsyncSessionLocal, async_engine
+from app.models.conversation import Conversation
+from app.models.turn import Turn
+from app.models.turn_outbox import TurnOutbox
+from app.models.user import Profile  # noqa: F401 (mapper configuration)
+
+logger = get_logger(__name__)
+
+# ConversationTurn fields carried in the outbox payload
+TURN_FIELDS = (
+    "user_transcription",
+    "grammar_is_correct",
+    "correction_feedback",
+    "reply_text_local",
+    "reply_text_english",
+    "sentiment_score",
+    "current_price",
+    "cultural_flag",
+    "cultural_feedback",
+)
+
+# Length of the latest-reply preview kept on conversations.last_message
+LAST_MESSAGE_PREVIEW_CHARS = 100
+
+
+async def enqueue_turn(
+    db: AsyncSession,
+    user_id: str,
+    conversation_id: str,
+    turn_number: int,
+    user_audio_bytes: bytes,
+    ai_audio_bytes: bytes,
+    ai_data,
+    ai_audio_content_type: Optional[str] = None,
+) -> int:
+    """Durably queue a completed turn for persistence; returns the outbox id."""
+    row = TurnOutbox(
+        conversation_id=conversation_id,
+        user_id=user_id,
+        turn_number=turn_number,
+        payload={field: getattr(ai_data, field) for field in TURN_FIELDS},
+        user_audio=user_audio_bytes or None,
+        user_audio_content_type=sniff_content_type(user_audio_bytes, default="audio/webm") if user_audio_bytes else None,
+        ai_audio=ai_audio_bytes or None,
+        ai_audio_content_type=ai_audio_content_type if ai_audio_bytes else None,
+    )
+    db.add(row)
+    await db.commit()
+    outbox_worker.notify()
+    return row.id
+
+
+def _turn_from_payload(row: TurnOutbox, user_audio_url: Optional[str], ai_audio_url: Optional[str]) -> Turn:
+    data = row.payload
+    return Turn(
+        conversation_id=row.conversation_id,
+        turn_number=row.turn_number,
+        user_audio_url=user_audio_url,
+        user_transcription=data["user_transcription"],
+        ai_response_text=data["reply_text_local"],
+        ai_response_text_english=data["reply_text_english"],
+        ai_response_audio_url=ai_audio_url,
+        grammar_correction=data["correction_feedback"],
+        grammar_score=10 if data["grammar_is_correct"] else 5,
+        sentiment_score=data["sentiment_score"],
+        negotiated_price=data["current_price"],
+        cultural_flag=data["cultural_flag"],
+        cultural_feedback=data["cultural_feedback"],
+    )
+
+
+class OutboxWorker:
+    """Polls the outbox and persists turns; one instance per process."""
+
+    def __init__(self):
+        self.batch_size = settings.OUTBOX_BATCH_SIZE
+        self.poll_interval = settings.OUTBOX_POLL_INTERVAL_SECONDS
+        self.max_attempts = settings.OUTBOX_MAX_ATTEMPTS
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def notify(self) -> None:
+        """Wake the in-process loop early (no-op when it isn't running here)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _backoff(self, attempts: int) -> timedelta:
+        seconds = settings.OUTBOX_BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1))
+        return timedelta(seconds=min(seconds, settings.OUTBOX_BACKOFF_MAX_SECONDS))
+
+    async def _claim(self, db: AsyncSession) -> List[TurnOutbox]:
+        """
+        Lock a batch of due rows, push their next attempt out by the lease
+        time and commit. Other workers skip locked rows; a worker that dies
+        mid-batch leaves rows that become due again when the lease expires.
+        """
+        now = datetime.now(timezone.utc)
+        rows = (await db.execute(
+            select(TurnOutbox)
+            .where(TurnOutbox.failed_at.is_(None), TurnOutbox.next_attempt_at <= now)
+            .order_by(TurnOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )).scalars().all()
+        for row in rows:
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+        await db.commit()
+        return rows
+
+    async def _reschedule(self, db: AsyncSession, row_id: int, attempts: int, error: str) -> None:
+        now = datetime.now(timezone.utc)
+        values = {"last_error": error[:1000], "next_attempt_at": now + self._backoff(attempts)}
+        if attempts >= self.max_attempts:
+            values["failed_at"] = now
+            self.failed += 1
+            logger.error("Outbox row %s failed permanently after %s attempts: %s", row_id, attempts, error)
+        else:
+            self.retried += 1
+            logger.warning("Outbox row %s attempt %s failed, retrying: %s", row_id, attempts, error)
+        await db.execute(update(TurnOutbox).where(TurnOutbox.id == row_id).values(**values))
+        await db.commit()
+
+    async def _prepare_upload(self, row: TurnOutbox, file_type: str) -> Optional[dict]:
+        """`upload_audio` arguments for one of the row's audio files, or None if it has none."""
+        audio = row.user_audio if file_type == "user" else row.ai_audio
+        if not audio:
+            return None
+        content_type = row.user_audio_content_type if file_type == "user" else row.ai_audio_content_type
+        if content_type is None:
+            audio, content_type = await transcode(audio)
+        return {
+            "audio_data": audio,
+            "user_id": row.user_id,
+            "conversation_id": row.conversation_id,
+            "turn_number": row.turn_number,
+            "file_type": file_type,
+            "content_type": content_type,
+        }
+
+    async def _upload_batch(self, rows: List[TurnOutbox]) -> Dict[int, Optional[Dict[str, Optional[str]]]]:
+        """
+        Upload every audio file of the batch concurrently (bounded by
+        STORAGE_UPLOAD_CONCURRENCY). Returns {row id: {file type: url}}, with
+        None for rows whose upload must be retried.
+        """
+        files = [(row, file_type) for row in rows for file_type in ("user", "ai")]
+        prepared = await asyncio.gather(*(self._prepare_upload(row, file_type) for row, file_type in files))
+        urls = iter(await storage_manager.upload_many([kwargs for kwargs in prepared if kwargs]))
+        results: Dict[int, Optional[Dict[str, Optional[str]]]] = {row.id: {} for row in rows}
+        for (row, file_type), kwargs in zip(files, prepared):
+            url = next(urls) if kwargs else None
+            # Keep retrying a failed upload; on the last attempt save the turn without it
+            if kwargs and url is None and row.attempts < self.max_attempts:
+                results[row.id] = None
+            elif results[row.id] is not None:
+                results[row.id][file_type] = url
+        return results
+
+    async def _save(self, db: AsyncSession, row_ids: List[int], turns: List[Turn]) -> None:
+        """
+        Insert the turns, refresh their conversations' counters and drop the
+        outbox rows in one transaction.
+        """
+        db.add_all(turns)
+        await db.flush()
+        # The preview is re-read from turns, so out-of-order retries still end on the latest turn
+        latest_text = (
+            select(func.substr(Turn.ai_response_text, 1, LAST_MESSAGE_PREVIEW_CHARS))
+            .where(Turn.conversation_id == Conversation.id)
+            .order_by(Turn.turn_number.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        for conversation_id, count in sorted(Counter(t.conversation_id for t in turns).items()):
+            await db.execute(
+                update(Conversation)
+                .where(Conversation.id == conversation_id)
+                .values(
+                    turn_count=Conversation.turn_count + count,
+                    last_message=latest_text,
+                    last_turn_at=func.now(),
+                )
+            )
+        await db.execute(delete(TurnOutbox).where(TurnOutbox.id.in_(row_ids)))
+        await db.commit()
+
+    async def process_batch(self) -> int:
+        """Claim and persist one batch; returns the number of rows claimed."""
+        async with AsyncSessionLocal() as db:
+            rows = await self._claim(db)
+            if not rows:
+                return 0
+
+            with stage("outbox_upload"):
+                uploaded = await self._upload_batch(rows)
+            # (row id, attempts, turn): plain values, since a rollback expires the rows
+            ready = []
+            for row in rows:
+                urls = uploaded[row.id]
+                if urls is None:
+                    await self._reschedule(db, row.id, row.attempts, "audio upload failed")
+                else:
+                    ready.append((row.id, row.attempts, _turn_from_payload(row, urls.get("user"), urls.get("ai"))))
+
+            if ready:
+                try:
+                    with stage("outbox_save"):
+                        await self._save(db, [row_id for row_id, _, _ in ready], [turn for _, _, turn in ready])
+                    self.processed += len(ready)
+                except Exception as e:
+                    # Isolate the bad row(s): retry the batch one turn at a time
+                    logger.warning("Batch insert of %s turns failed (%s); saving individually", len(ready), e)
+                    await db.rollback()
+                    for row_id, attempts, turn in ready:
+                        try:
+                            await self._save(db, [row_id], [turn])
+                            self.processed += 1
+                        except Exception as row_error:
+                            await db.rollback()
+                            await self._reschedule(db, row_id, attempts, str(row_error))
+            logger.info("Outbox batch: %s claimed, %s persisted", len(rows), len(ready))
+            return len(rows)
+
+    async def run(self) -> None:
+        """Process batches until stop() is called; a running batch is always finished."""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        logger.info("Outbox worker started (batch size %s)", self.batch_size)
+        while not self._stopping:
+            try:
+                claimed = await self.process_batch()
+            except Exception as e:
+                logger.exception("Outbox worker error: %s", e)
+                claimed = 0
+            if claimed < self.batch_size and not self._stopping:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self, drain_timeout: float = None) -> None:
+        """Stop polling and drain: let the current batch finish, then flush what is due."""
+        drain_timeout = settings.OUTBOX_DRAIN_TIMEOUT_SECONDS if drain_timeout is None else drain_timeout
+        self._stopping = True
+        self.notify()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + drain_timeout
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Outbox worker did not finish its batch within %.0fs", drain_timeout)
+                self._task.cancel()
+                return
+        while loop.time() < deadline:
+            try:
+                if await asyncio.wait_for(self.process_batch(), timeout=deadline - loop.time()) == 0:
+                    break
+            except Exception as e:
+                logger.warning("Outbox drain stopped: %s", e)
+                break
+        logger.info("Outbox worker stopped")
+
+    async def stats(self) -> dict:
+        snapshot = {"processed": self.processed, "retried": self.retried, "failed": self.failed}
+        snapshot.update(await outbox_depth())
+        return snapshot
+
+
+async def outbox_depth() -> dict:
+    """Pending and dead-lettered row counts and the age of the oldest pending row."""
+    async with AsyncSessionLocal() as db:
+        pending, oldest = (await db.execute(
+            select(func.count(), func.min(TurnOutbox.created_at)).where(TurnOutbox.failed_at.is_(None))
+        )).one()
+        dead = (await db.execute(
+            select(func.count()).select_from(TurnOutbox).where(TurnOutbox.failed_at.is_not(None))
+        )).scalar_one()
+    lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+    return {"depth": pending, "dead": dead, "lag_seconds": round(lag, 1)}
+
+
+async def refresh_outbox_gauges() -> None:
+    depth = await outbox_depth()
+    OUTBOX_ROWS.labels("pending").set(depth["depth"])
+    OUTBOX_ROWS.labels("dead").set(depth["dead"])
+    OUTBOX_LAG_SECONDS.set(depth["lag_seconds"])
+
+
+outbox_worker = OutboxWorker()
+register_stats("outbox", outbox_worker.stats)
+register_gauge_refresher(refresh_outbox_gauges)
+
+
+async def main() -> None:
+    from app.core.http_clients import client_pool
+
+    configure_logging(settings.LOG_LEVEL)
+    await client_pool.startup()
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    outbox_worker.start()
+    await stop.wait()
+    logger.info("Shutdown requested; draining outbox")
+    try:
+        await outbox_worker.stop()
+    finally:
+        await client_pool.shutdown()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
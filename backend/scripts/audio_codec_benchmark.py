@@ -0,0 +1,81 @@
+"""
+Compare bytes per turn for TTS audio as delivered (base64 data URI) per codec.
+Usage: python scripts/audio_codec_benchmark.py [sample.wav ...] [--bitrate 24k]
+       python scripts/audio_codec_benchmark.py --text "Ẹ káàrọ̀" --language yoruba
+
+Without inputs, a 6 second synthetic 24 kHz mono tone is used.
+"""
+import argparse
+import asyncio
+import math
+import struct
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.logging import configure_logging, get_logger
+from app.core.http_clients import client_pool
+from app.audio.formats import pcm_to_wav
+from app.audio.transcode import CODECS, ffmpeg_path, transcode
+
+
+def synthetic_sample(seconds: float = 6.0, rate: int = 24000) -> bytes:
+    """Amplitude-modulated tone roughly in the voice band."""
+    frames = bytearray()
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        envelope = 0.5 + 0.5 * math.sin(2 * math.pi * 3 * t)
+        sample = envelope * (0.6 * math.sin(2 * math.pi * 180 * t) + 0.3 * math.sin(2 * math.pi * 720 * t))
+        frames += struct.pack("<h", int(sample * 12000))
+    return pcm_to_wav(bytes(frames), sample_rate=rate)
+
+
+def data_uri_size(n: int) -> int:
+    return 4 * math.ceil(n / 3)
+
+
+async def benchmark(files: list, text: str | None, language: str, bitrate: str):
+    configure_logging()
+    logger = get_logger(__name__)
+    if ffmpeg_path() is None:
+        logger.error("ffmpeg is required for this benchmark")
+        return
+
+    samples = [(f, Path(f).read_bytes()) for f in files]
+    if text:
+        from app.tts import synthesize_speech
+        try:
+            samples.append((f"tts:{language}", await synthesize_speech(text, language)))
+        finally:
+            await client_pool.shutdown()
+    if not samples:
+        samples.append(("synthetic", synthetic_sample()))
+
+    logger.info("%-24s %-6s %10s %10s %8s %8s", "sample", "codec", "bytes", "data-uri", "ratio", "ms")
+    for name, raw in samples:
+        if not raw:
+            logger.warning("%s: no audio", name)
+            continue
+        logger.info("%-24s %-6s %10s %10s %8s %8s", name, "raw", len(raw), data_uri_size(len(raw)), "1.0x", "-")
+        for codec in CODECS:
+            start = time.perf_counter()
+            encoded, content_type = await transcode(raw, codec=codec, bitrate=bitrate)
+            elapsed = (time.perf_counter() - start) * 1000
+            logger.info(
+                "%-24s %-6s %10s %10s %7.1fx %8.0f%s",
+                name, codec, len(encoded), data_uri_size(len(encoded)), len(raw) / len(encoded), elapsed,
+                "" if encoded is not raw else "  (not encoded)",
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="Audio files to encode (any format ffmpeg reads)")
+    parser.add_argument("--text", help="Synthesize this text with the configured TTS provider")
+    parser.add_argument("--language", choices=["yoruba", "hausa", "igbo"], default="yoruba")
+    parser.add_argument("--bitrate", default="24k")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.files, args.text, args.language, args.bitrate))
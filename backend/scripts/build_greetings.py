@@ -0,0 +1,49 @@
+"""
+Pre-generate the opening greeting (text + audio) for every scenario and proficiency level.
+Usage: python scripts/build_greetings.py [--language yoruba] [--force]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.logging import configure_logging, get_logger
+from app.core.http_clients import client_pool
+from app.data.scenario_loader import get_scenario_loader
+from app.ai.greetings import greeting_store, PROFICIENCY_LEVELS
+
+
+async def build_greetings(language: str | None, force: bool):
+    configure_logging()
+    logger = get_logger(__name__)
+    scenarios = get_scenario_loader().get_all_scenarios()
+    if language:
+        scenarios = [s for s in scenarios if s['language'] == language]
+
+    built = skipped = failed = 0
+    try:
+        for scenario in scenarios:
+            for proficiency in PROFICIENCY_LEVELS:
+                if not force and greeting_store.get(scenario['id'], proficiency):
+                    skipped += 1
+                    continue
+                if await greeting_store.build(scenario, proficiency):
+                    built += 1
+                else:
+                    failed += 1
+    finally:
+        await client_pool.shutdown()
+
+    logger.info("Greetings built: %s, skipped (already stored): %s, failed: %s", built, skipped, failed)
+    logger.info("Store: %s", greeting_store.root)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--language", choices=["yoruba", "hausa", "igbo"])
+    parser.add_argument("--force", action="store_true", help="Rebuild greetings that already exist")
+    args = parser.parse_args()
+    asyncio.run(build_greetings(args.language, args.force))
@@ -0,0 +1,57 @@
+"""
+Report the compiled system prompt size per scenario and proficiency level.
+Usage: python scripts/prompt_token_report.py [--language yoruba] [--count-with gemini]
+
+With --count-with gemini, tokens are counted by the Gemini API; otherwise
+they are estimated (~4 characters per token).
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.logging import configure_logging, get_logger
+from app.core.http_clients import client_pool
+from app.ai.agent import CANDIDATE_MODELS
+from app.ai.context_cache import GeminiPromptCache, PromptCacheProvider
+from app.ai.prompt_builder import compile_system_prompt
+from app.ai.greetings import PROFICIENCY_LEVELS
+from app.core.config import settings
+from app.data.scenario_loader import get_scenario_loader
+
+
+async def report(language: str | None, count_with: str):
+    configure_logging()
+    logger = get_logger(__name__)
+    if count_with == "gemini":
+        counter = GeminiPromptCache(settings.PROMPT_CACHE_TTL_SECONDS, settings.PROMPT_CACHE_MIN_TOKENS)
+    else:
+        counter = PromptCacheProvider()
+    scenarios = get_scenario_loader().get_all_scenarios()
+    if language:
+        scenarios = [s for s in scenarios if s['language'] == language]
+
+    try:
+        logger.info("%-40s %-13s %8s %8s  cacheable(>=%s)", "scenario", "level", "chars", "tokens", settings.PROMPT_CACHE_MIN_TOKENS)
+        for scenario in scenarios:
+            for proficiency in PROFICIENCY_LEVELS:
+                prompt = compile_system_prompt(scenario['language'], scenario['id'], proficiency)
+                tokens = await counter.count_tokens(CANDIDATE_MODELS[0], prompt)
+                logger.info(
+                    "%-40s %-13s %8s %8s  %s",
+                    scenario['id'], proficiency, len(prompt), tokens,
+                    "yes" if tokens >= settings.PROMPT_CACHE_MIN_TOKENS else "no",
+                )
+    finally:
+        await client_pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--language", choices=["yoruba", "hausa", "igbo"])
+    parser.add_argument("--count-with", choices=["estimate", "gemini"], default="estimate")
+    args = parser.parse_args()
+    asyncio.run(report(args.language, args.count_with))
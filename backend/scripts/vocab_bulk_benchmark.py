@@ -0,0 +1,89 @@
+"""
+Time saving N words one request at a time (select + insert + commit each)
+against a single bulk INSERT ... ON CONFLICT, on the configured DATABASE_URL.
+Usage: python scripts/vocab_bulk_benchmark.py [--words 100] [--rounds 3]
+
+A throwaway profile is created for the run and deleted afterwards.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, select
+from app.core.logging import configure_logging, get_logger
+from app.db.base import AsyncSessionLocal, async_engine
+from app.models.saved_word import SavedWord
+from app.models.schemas import SaveWordRequest
+from app.models.user import Profile
+from app.api.v1.vocabulary import save_words
+
+LANGUAGE = "yoruba"
+
+
+async def save_one_by_one(user_id: str, items: list) -> None:
+    """The old per-word path: duplicate check, insert, commit, refresh."""
+    for item in items:
+        async with AsyncSessionLocal() as db:
+            existing = (await db.execute(select(SavedWord.id).where(
+                SavedWord.user_id == user_id, SavedWord.word == item.word
+            ).limit(1))).scalar_one_or_none()
+            if existing:
+                continue
+            row = SavedWord(user_id=user_id, word=item.word, translation=item.translation, language=LANGUAGE)
+            db.add(row)
+            await db.commit()
+            await db.refresh(row)
+
+
+async def save_bulk(user_id: str, items: list) -> None:
+    async with AsyncSessionLocal() as db:
+        await save_words(db, user_id, LANGUAGE, items)
+
+
+async def clear_words(user_id: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(SavedWord).where(SavedWord.user_id == user_id))
+        await db.commit()
+
+
+async def benchmark(n_words: int, rounds: int) -> None:
+    configure_logging()
+    logger = get_logger(__name__)
+    user_id = f"bench-{uuid.uuid4()}"
+    items = [SaveWordRequest(word=f"word-{i}", translation=f"translation {i}") for i in range(n_words)]
+
+    async with AsyncSessionLocal() as db:
+        db.add(Profile(id=user_id, email=f"{user_id}@example.invalid"))
+        await db.commit()
+    try:
+        logger.info("%-22s %10s %12s", "mode", "ms", "words/s")
+        for name, fn in (("one-by-one", save_one_by_one), ("bulk", save_bulk), ("bulk (all duplicate)", save_bulk)):
+            timings = []
+            for _ in range(rounds):
+                if name != "bulk (all duplicate)":
+                    await clear_words(user_id)
+                started = time.perf_counter()
+                await fn(user_id, items)
+                timings.append(time.perf_counter() - started)
+            best = min(timings)
+            logger.info("%-22s %10.1f %12.0f", name, best * 1000, n_words / best)
+    finally:
+        await clear_words(user_id)
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Profile).where(Profile.id == user_id))
+            await db.commit()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.words, args.rounds))